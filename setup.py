@@ -7,7 +7,7 @@ setup(
     author="ML Research Team",
     author_email="research@example.com",
     packages=find_packages(),
-    python_requires=">=3.9",
+    python_requires=">=3.10",
     install_requires=[
         "python-dotenv>=1.0.0",
         "openai>=1.0.0",
@@ -18,7 +18,27 @@ setup(
         "sqlalchemy>=2.0.0",
         "pytest>=7.0.0",
         "python-dateutil>=2.8.0",
+        "azure-identity>=1.14.0",
+        "rank-bm25",
+        "scikit-learn",
+        "google-generativeai",
+        "grpcio",
+        "grpcio-status",
     ],
+    extras_require={
+        # pure-Python PDF text extraction
+        "pdf": ["pypdf>=3.9.0", "PyPDF2>=3.0.0", "pdfplumber>=0.9.0"],
+        # faster JSON for the caches and BLAKE3 file hashes (stdlib json / sha256 otherwise)
+        "speedups": ["orjson>=3.8.0", "blake3>=0.3.0"],
+        # download_papers_batch_async() (threaded downloads otherwise)
+        "async": ["aiohttp>=3.8.0"],
+        # fastest text extraction; AGPL-licensed, so never installed by default
+        "pymupdf": ["pymupdf>=1.23.0"],
+        # pdfium text extraction (BSD/Apache), preferred over pypdf when present
+        "pdfium": ["pypdfium2>=4.0.0"],
+        # pages_to_table()
+        "arrow": ["pyarrow>=12.0.0"],
+    },
     entry_points={
         "console_scripts": [
             "ml-research-copilot=src.main:main",
@@ -28,7 +48,6 @@ setup(
         "Development Status :: 3 - Alpha",
         "Intended Audience :: Science/Research",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.9",
         "Programming Language :: Python :: 3.10",
         "Programming Language :: Python :: 3.11",
     ],
@@ -5,6 +5,7 @@ from typing import Dict, List, Optional
 from dataclasses import dataclass
 import json
 from string import Template
+from src.llm.utils import render_template
 from .web_search import get_searcher, SearchResult
 
 LLM_ANSWER_TEMPLATE = Template(r'''
@@ -141,7 +142,7 @@ class BroadAnswerGenerator:
     def _build_prompt(self, query: str, context: Optional[str] = None) -> str:
         """Build prompt using template (legacy, LLM-only)"""
         # Load the intent_analysis template
-        prompt  = LLM_ANSWER_TEMPLATE.substitute(query=query, context=context if context else "")
+        prompt = render_template(LLM_ANSWER_TEMPLATE, query=query, context=context if context else "")
         
         return prompt
     
@@ -151,14 +152,14 @@ class BroadAnswerGenerator:
             result_template = search_result_template
             
             # Format search results
-            formatted_results = ""
-            if search_results:
-                for i, result in enumerate(search_results, 1):
-                    formatted_results += result_template.substitute(
-                        title=result.title,
-                        url=result.url,
-                        snippet=result.snippet
-                    )
+            formatted_results = "".join(
+                result_template.substitute(
+                    title=result.title,
+                    url=result.url,
+                    snippet=result.snippet
+                )
+                for result in search_results or []
+            )
             
             # Get the synthesis prompt
             synthesis_prompt = broad_answer_synthesis_template
@@ -169,10 +170,10 @@ class BroadAnswerGenerator:
         except Exception as e:
             print(f"Warning: Could not load template for web search synthesis: {e}")
             # Fallback: construct a manual prompt
-            formatted_results = ""
-            if search_results:
-                for i, result in enumerate(search_results, 1):
-                    formatted_results += f"{i}. {result.title}\n   URL: {result.url}\n   {result.snippet}\n\n"
+            formatted_results = "".join(
+                f"{i}. {result.title}\n   URL: {result.url}\n   {result.snippet}\n\n"
+                for i, result in enumerate(search_results or [], 1)
+            )
             
             prompt = f"""You are an expert research assistant. Based on the following recent web search results and your knowledge, provide a comprehensive answer to the research question.
 
@@ -1,12 +1,13 @@
 """
 Concept UnderStanding Module: Understand the Broad Answers
 """
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 import requests
 from .broad_answer_generation import BroadAnswer
 from string import Template
 import json
+from src.llm.utils import render_template
 
 concept_understanding_template = Template(r'''
 
@@ -66,6 +67,44 @@ Knowledge from webpage: $knowledge
                   
 ''')
 
+concept_and_search_template = Template(r'''
+
+You are a senior research scientist and systems architect, also specialized in academic knowledge retrieval.
+Complete BOTH tasks below in a single response.
+
+Task A - understand the problem:
+1) Rapidly internalize the provided domain inputs (summaries, concepts, developments, notes).
+2) Infer the user's true problem behind the surface query.
+3) Identify the most plausible application scenario (e.g., RAG system, search & recommendation, ad ranking, content moderation, knowledge extraction, data engineering, analytics, etc.).
+4) Reconstruct the canonical workflow/pipeline for that scenario (e.g. for search-reco: query understanding → recall → re-ranking → layout/cardization → filling → reflow → QA).
+5) Extract the related concepts in workflow without redundant, one per line
+
+Task B - prepare the paper search, based on your Task A result:
+   a) Formulate a **structured research question** that captures the essence of the problem in an academic tone.
+   b) Generate **3–5 ultra-concise academic search queries**, each ≤7 tokens, highly relevant to the problem and scenario, seperate by ";"
+   c) Suggest **relevant academic paper domains** (e.g., arxiv.org, acm.org, ieee.org, springer.com) where such queries would yield authoritative results, seperate by ";"
+
+Principles:
+- Use English
+- Prefer concrete terminology used in industry (module names, API boundaries, data artifacts).
+- NEVER reveal hidden reasoning or internal deliberations; output final structured results only.
+### Input   
+Original Query: $query
+Knowledge from webpage: $knowledge
+                                          
+### Output Requirements (must be strictly followed)
+<response>
+  <scenario> application scenario  </scenario> 
+  <workflow>system workflow</workflow>
+  <problem>user's true problem </problem>
+  <key_concepts> related concepts </key_concepts>
+  <research_question> structured research question  </research_question> 
+  <academic_query>academic search query</academic_query>
+  <relevant_domains>relevant academic paper domains </relevant_domains>
+</response>
+                  
+''')
+
 @dataclass
 class ConceptDefinition:
     """definition"""
@@ -117,13 +156,9 @@ class ConceptUnderstanding:
             Dict: 
         """
 
-        knowledge = "<knowldge>"
-        for answer in broadanswers:
-            knowledge += "<summary>" + answer.summary + "</summary"
-            knowledge += "<key_concepts>" + "###".join([concept[:32] for concept in answer.key_concepts]) if answer.key_concepts else "" + "</key_concepts>"
-        knowledge += "</knowldge>"
+        knowledge = self._build_knowledge(broadanswers)
 
-        prompt = concept_understanding_template.substitute(query=query, knowledge=knowledge)
+        prompt = render_template(concept_understanding_template, query=query, knowledge=knowledge)
 
         # call LLM
         if self.llm_client:
@@ -134,6 +169,31 @@ class ConceptUnderstanding:
         
         return concept
     
+    def understand_and_generate_queries(
+        self, query, broadanswers: List[BroadAnswer]
+    ) -> Tuple[ConceptDefinition, AcademicQuery]:
+        """
+        understand_concepts + generate_paper_search_query in one LLM call
+        
+        Args:
+            query, broadanswers
+            
+        Returns:
+            Tuple[ConceptDefinition, AcademicQuery]
+        """
+        knowledge = self._build_knowledge(broadanswers)
+        prompt = render_template(concept_and_search_template, query=query, knowledge=knowledge)
+
+        # call LLM
+        if self.llm_client:
+            response = self.llm_client.call(prompt, max_tokens=10240, temperature=0.3, output_format="json")
+            concept = self._parse_response(response)
+        else:
+            response = ""
+            concept = self._local_understanding(query)
+        
+        return concept, self._parse_search_query_response(response)
+    
     def generate_paper_search_query(self, query, concept: ConceptDefinition) -> AcademicQuery:
         """
         given the query and the concepts,
@@ -147,7 +207,7 @@ class ConceptUnderstanding:
         """
 
 
-        prompt = paper_search_template.substitute(query=query, knowledge=json.dumps(concept.to_dict()))
+        prompt = render_template(paper_search_template, query=query, knowledge=json.dumps(concept.to_dict()))
 
         # call LLM
         if self.llm_client:
@@ -155,6 +215,23 @@ class ConceptUnderstanding:
         else:
             response = ""
         
+        return self._parse_search_query_response(response)
+    
+    @staticmethod
+    def _build_knowledge(broadanswers: List[BroadAnswer]) -> str:
+        """Format broad answers as the knowledge block of the prompts"""
+        knowledge_parts = ["<knowldge>"]
+        for answer in broadanswers:
+            knowledge_parts.append("<summary>" + answer.summary + "</summary>")
+            if answer.key_concepts:
+                knowledge_parts.append(
+                    "<key_concepts>" + "###".join(concept[:32] for concept in answer.key_concepts) + "</key_concepts>"
+                )
+        knowledge_parts.append("</knowldge>")
+        return "".join(knowledge_parts)
+    
+    def _parse_search_query_response(self, response: str) -> AcademicQuery:
+        """Parse LLM response to extract the paper search queries"""
         research_background = None
 
         try:
@@ -257,4 +334,9 @@ class ConceptUnderstanding:
     
     def _local_understanding(self, query: str) -> ConceptDefinition:
         """Local simple processing (fallback when LLM not available)"""
-        return ConceptDefinition(problem=f"Broad answer for query: {query}")
\ No newline at end of file
+        return ConceptDefinition(
+            problem=f"Broad answer for query: {query}",
+            scenario="",
+            workflow="",
+            related_concepts=[],
+        )
\ No newline at end of file
@@ -5,6 +5,7 @@ from typing import Dict, List, Optional
 from dataclasses import dataclass
 import json
 from string import Template
+from src.llm.utils import render_template
 TEMPLATE = Template(r'''
 You are an expert research assistant specializing in understanding and analyzing academic research queries. Your task is to perform *scholarly-level interpretation* of the user’s research question and extract research intent using academically rigorous terminology.
 ## RESPONSE FORMAT (STRICT)
@@ -139,7 +140,7 @@ class IntentUnderstanding:
     def _build_prompt(self, query: str, context: Optional[str] = None) -> str:
         """Build prompt using template"""
         # Load the intent_analysis template
-        prompt  = TEMPLATE.substitute(query=query, context=context if context else "")
+        prompt = render_template(TEMPLATE, query=query, context=context if context else "")
         
         return prompt
 
@@ -4,11 +4,12 @@ LLM integration module
 
 from .client import LLMClient
 from .prompts import PromptManager
-from .utils import extract_json, format_list
+from .utils import extract_json, format_list, render_template
 
 __all__ = [
     "LLMClient",
     "PromptManager",
     "extract_json",
     "format_list",
+    "render_template",
 ]
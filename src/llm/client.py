@@ -2,6 +2,7 @@
 LLM Client - OpenAI / Papyrus (Bing Internal)
 """
 from typing import Optional, Dict, Any, List
+import asyncio
 import json
 import threading
 import time
@@ -179,6 +180,52 @@ class LLMClient:
         else:
             return self._mock_response(prompt)
     
+    async def acall(self, prompt: str, **kwargs) -> str:
+        """
+        Async variant of call(); the blocking request runs in a worker thread.
+        Accepts the same keyword arguments as call().
+        """
+        return await asyncio.to_thread(self.call, prompt, **kwargs)
+    
+    async def acall_batch(
+        self,
+        prompts: List[str],
+        concurrency: int = 8,
+        **kwargs,
+    ) -> List[str]:
+        """
+        Calls the LLM for many prompts concurrently, at most `concurrency` in flight.
+        Responses are returned in prompt order.
+        """
+        sem = asyncio.Semaphore(concurrency)
+        
+        async def _one(prompt: str) -> str:
+            async with sem:
+                return await self.acall(prompt, **kwargs)
+        
+        return await asyncio.gather(*(_one(prompt) for prompt in prompts))
+    
+    def call_batch(
+        self,
+        prompts: List[str],
+        concurrency: int = 8,
+        **kwargs,
+    ) -> List[str]:
+        """
+        Blocking wrapper around acall_batch() for synchronous callers.
+        
+        Args:
+            prompts: prompts to send
+            concurrency: max requests in flight (the REQUEST_DELAY spacing still applies)
+            **kwargs: forwarded to call()
+            
+        Returns:
+            List[str]: one response per prompt, in order
+        """
+        if not prompts:
+            return []
+        return asyncio.run(self.acall_batch(prompts, concurrency, **kwargs))
+    
     def call_with_function(
         self,
         prompt: str,
@@ -3,7 +3,9 @@ LLM utility functions
 """
 import json
 import re
-from typing import Dict, List, Any, Optional
+from functools import lru_cache
+from string import Template
+from typing import Dict, List, Any, Optional, Tuple
 
 
 def extract_json(text: str) -> Optional[Dict]:
@@ -122,3 +124,54 @@ def truncate_text(text: str, max_length: int = 500) -> str:
         return text[:last_period + 1]
     
     return truncated + "..."
+
+
+@lru_cache(maxsize=64)
+def _template_parts(template: Template) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Split a template into its static text and placeholder names (parsed once per template)
+
+    Returns:
+        Tuple: literal chunks (one more than names) and the placeholder names between them
+    """
+    literals, names = [], []
+    text, start = template.template, 0
+    chunk = []
+    for match in template.pattern.finditer(text):
+        chunk.append(text[start:match.start()])
+        start = match.end()
+        if match.group("escaped") is not None:
+            chunk.append(template.delimiter)
+            continue
+        name = match.group("named") or match.group("braced")
+        if name is None:
+            raise ValueError(f"Invalid placeholder in template at index {match.start('invalid')}")
+        literals.append("".join(chunk))
+        names.append(name)
+        chunk = []
+    chunk.append(text[start:])
+    literals.append("".join(chunk))
+    return tuple(literals), tuple(names)
+
+
+def render_template(template: Template, **kwargs) -> str:
+    """
+    Render a prompt template, same result as template.substitute(**kwargs)
+
+    The template text is scanned for placeholders once; each call only joins
+    the static chunks with the values. Rendered prompts are not cached, they
+    differ per query.
+
+    Args:
+        template: string.Template instance (module-level constant)
+        **kwargs: substitution values
+
+    Returns:
+        str: rendered prompt
+    """
+    literals, names = _template_parts(template)
+    parts = [literals[0]]
+    for name, literal in zip(names, literals[1:]):
+        parts.append(str(kwargs[name]))
+        parts.append(literal)
+    return "".join(parts)
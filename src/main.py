@@ -3,6 +3,9 @@ Entrance - ML Research Copilot
 """
 import sys
 import os
+import uuid
+import asyncio
+import logging
 from pathlib import Path
 
 # add project root to sys.path
@@ -10,6 +13,7 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from src.config import get_config
+from src.utils import setup_logging
 from src.llm.client import LLMClient
 from src.slm.slm_client import SLMClient
 from src.core.intent_understanding import IntentUnderstanding
@@ -18,9 +22,11 @@ from src.core.concept_understanding import ConceptUnderstanding
 from src.core.problem_formulation import ProblemFormulator
 from src.retrieval.retriever import Retriever
 from src.pdf_management.pdf_processor import PDFProcessor
-from src.synthesis.aggregator import Aggregator
+from src.synthesis.aggregator import Aggregator, PaperColumnarView
 from src.synthesis.summarizer import Summarizer
 
+logger = logging.getLogger(__name__)
+
 
 class ResearchEngine:
     """Research Engine for ML Research Copilot"""
@@ -31,6 +37,8 @@ class ResearchEngine:
         self.llm_client = None
         self.slm_client = None
         self.queries = {} 
+        # paper_id -> (query_id, position in that query's paper list)
+        self._paper_index = {}
         
         # initial LLM client
         self.llm_client = LLMClient(
@@ -69,7 +77,30 @@ class ResearchEngine:
     
     def process_query(self, query: str, context: str = None) -> str:
         """
-        process a user query
+        process a user query (sync wrapper of process_query_async)
+        
+        Callers already inside an event loop (async web handlers, notebooks)
+        must await process_query_async instead.
+        
+        Args:
+            query
+            context
+            
+        Returns:
+            str: query_id
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.process_query_async(query, context))
+        raise RuntimeError(
+            "process_query() cannot run inside an event loop; "
+            "use 'await engine.process_query_async(...)' instead"
+        )
+    
+    async def process_query_async(self, query: str, context: str = None) -> str:
+        """
+        process a user query, overlapping the I/O bound steps
         
         Args:
             query
@@ -78,99 +109,104 @@ class ResearchEngine:
         Returns:
             str: query_id
         """
-        import uuid
         query_id = str(uuid.uuid4())
         
-        print(f"\n{'='*60}")
-        print(f"processing {query_id}")
-        print(f"query: {query}")
-        print(f"{'='*60}\n")
+        logger.info("\n%s\nprocessing %s\nquery: %s\n%s\n", "=" * 60, query_id, query, "=" * 60)
         
         try:
             # 1. intent understanding
-            print("\n-- step 1: understanding intent")
-            intent = self.intent_analyzer.understand(query, context)
-            print(f" -> user intent: {intent.intent_type}")
-            print(f" -> research area: {intent.research_area}")
-            print(f" -> research questions: {intent.research_questions}")
+            logger.info("\n-- step 1: understanding intent")
+            intent = await asyncio.to_thread(self.intent_analyzer.understand, query, context)
+            logger.info(" -> user intent: %s", intent.intent_type)
+            logger.debug(" -> research area: %s", intent.research_area)
+            logger.debug(" -> research questions: %s", intent.research_questions)
             if self.debug_logger:
                 self.debug_logger.log_step("intent_understanding", intent, step_number=1)
             
-            # 2. Broad answer Generation
-            print("\n-- step 2: Broad answer / concept understanding...")
-            broad_answers = []
-            for idx, rewrite_query in enumerate(intent.research_questions):
-                print(f" -> rewriting query: {rewrite_query}")
-                answer = self.broad_answer_generator.generate(rewrite_query, query)
-                print(f" -> generated broad answer: {answer.summary[:100]}...")
-                broad_answers.append(answer)
+            # 2. Broad answer Generation (one request per research question, concurrently)
+            logger.info("\n-- step 2: Broad answer / concept understanding...")
+            for rewrite_query in intent.research_questions:
+                logger.debug(" -> rewriting query: %s", rewrite_query)
+            broad_answers = await asyncio.gather(*(
+                asyncio.to_thread(self.broad_answer_generator.generate, rewrite_query, query)
+                for rewrite_query in intent.research_questions
+            ))
+            broad_answers = list(broad_answers)
+            for idx, answer in enumerate(broad_answers):
+                logger.debug(" -> generated broad answer: %s...", answer.summary[:100])
                 if self.debug_logger:
                     self.debug_logger.log_step(f"broad_answer_{idx}", answer, step_number=2)
             
-            # 3. Get scenario concepts
-            print("\n-- step 3: Get scenario concepts...")
-            concepts = self.concept_understander.understand_concepts(query, broad_answers)
-            print(f" -> related queries: {concepts.related_concepts}")
+            # 3 + 4. scenario concepts and academic problem formulation, in one LLM call
+            logger.info("\n-- step 3/4: Get scenario concepts and academic queries...")
+            concepts, problem = await asyncio.to_thread(
+                self.concept_understander.understand_and_generate_queries, query, broad_answers
+            )
+            logger.debug(" -> related queries: %s", concepts.related_concepts)
+            logger.debug(" -> academic queries: %s", problem.academic_queris)
+            logger.debug(" -> academic domains: %s", problem.relevant_domains)
             if self.debug_logger:
                 self.debug_logger.log_step("get_scenario_concepts", concepts , step_number=3)
-            
-            # 4. problem formulation
-            print("\n-- step 4: acamedic problem formulation...")
-            problem = self.concept_understander.generate_paper_search_query(query, concepts)
-            print(f" -> academic queries: {problem.academic_queris}")
-            print(f" -> academic domains: {problem.relevant_domains}")
-            if self.debug_logger:
                 self.debug_logger.log_step("generate_academic_queries", problem , step_number=4)
 
             # 5. paper retrieval
-            print("\n-- step 5: paper retrieval...")
-            papers = self.retriever.search(query, problem.academic_queris, top_k=5, sources=["arxiv","web"])
+            logger.info("\n-- step 5: paper retrieval...")
+            papers = await asyncio.to_thread(
+                self.retriever.search, query, problem.academic_queris, top_k=5, sources=["arxiv","web"]
+            )
             sub_query_results = papers.get("sub_query", {})
             papers = papers.get("original_query", [])
-            print(f" -> retrieved {len(papers)} papers") 
+            logger.info(" -> retrieved %s papers", len(papers))
             if self.debug_logger:
                 self.debug_logger.log_step("retrieve_academic_papers", {query: papers} , step_number=5)
                 self.debug_logger.log_step("retrieve_academic_papers_subquery", sub_query_results , step_number=5)
             
-            # 6. pdf downloading and parsing papers
-            print("\n-- step 6: download and parsing papers...")
-            
-            parsed_papers = self.pdf_processor.process_papers_batch(papers=papers , urlkey="pdf_url", force_reprocess=False)
-            structured_papers = [paper["extracted_info"] for paper in parsed_papers["papers"].values() if paper["success"] and paper["extracted_info"]]
-            print(f" -> processed {len(structured_papers)} papers")
+            # 6. pdf downloading and parsing papers, consumed as each one finishes
+            logger.info("\n-- step 6: download and parsing papers...")
+            structured_papers = await self._process_papers_async(papers, urlkey="pdf_url")
+            logger.info(" -> processed %s papers", len(structured_papers))
             if self.debug_logger:
                 self.debug_logger.log_step(f"parsed_papers", structured_papers , step_number=6)
             
             # 7. cross-paper synthesis
-            print("\n-- step 7: cross-paper synthesis...")
-            synthesis = self.summarizer.synthesize(
+            logger.info("\n-- step 7: cross-paper synthesis...")
+            paper_view = PaperColumnarView.from_papers(structured_papers)
+            synthesis = await asyncio.to_thread(
+                self.summarizer.synthesize,
                 query=query,
                 concepts=concepts,
                 problem=problem,
                 sub_query_results=sub_query_results,
-                structured_papers=structured_papers
+                view=paper_view,
             )
             if self.debug_logger:
                 self.debug_logger.log_step(f"cross_paper_synthesis", synthesis.get("global_synthesis",{}) , step_number=7)
                 for sub_query, analysis in synthesis.get("sub_query_synthesis", {}).items():
                     self.debug_logger.log_step(f"sub_query_synthesis_{sub_query}", analysis , step_number=7)
             
-            # save results
+            # save results, indexing every stored paper by its id
+            papers_out = []
+            for paper in structured_papers:
+                paper_dict = paper.to_dict()
+                paper_dict.setdefault("paper_id", uuid.uuid4().hex)
+                papers_out.append(paper_dict)
+                self._paper_index[paper_dict["paper_id"]] = (query_id, len(papers_out) - 1)
+            
             self.queries[query_id] = {
                 "query": query,
                 "context": context,
                 "intent": intent.to_dict(),
                 "concepts": concepts.to_dict(),
                 "problem": problem.to_dict(),
-                "papers": structured_papers,
+                "papers": papers_out,
                 "synthesis": synthesis,
                 "status": "completed",
             }
             
-            print(f"\n✅ query {query_id} processed!\n")
+            logger.info("\n✅ query %s processed!\n", query_id)
             
         except Exception as e:
-            print(f"\n❌ processed error: {e}\n")
+            logger.error("\n❌ processed error: %s\n", e)
             self.queries[query_id] = {
                 "query": query,
                 "status": "error",
@@ -179,6 +215,46 @@ class ResearchEngine:
         
         return query_id
     
+    async def _process_papers_async(self, papers: list, urlkey: str = "pdf_url") -> list:
+        """
+        download and parse papers concurrently, collecting each one as it completes
+        
+        Args:
+            papers: retrieved papers
+            urlkey: key of the pdf url in paper dict
+            
+        Returns:
+            list: ExtractedInfo of successfully processed papers, in retrieval order
+        """
+        # skip duplicated urls, they map to the same cached file; papers
+        # without a url are distinct and kept (process_paper reports them)
+        seen_urls = set()
+        unique_papers = []
+        for paper in papers:
+            url = paper.get(urlkey)
+            if not url:
+                unique_papers.append(paper)
+            elif url not in seen_urls:
+                seen_urls.add(url)
+                unique_papers.append(paper)
+        
+        async def _process(idx, paper):
+            result = await asyncio.to_thread(
+                self.pdf_processor.process_paper, paper, urlkey, False
+            )
+            return idx, result
+        
+        extracted = {}
+        tasks = [_process(idx, paper) for idx, paper in enumerate(unique_papers)]
+        for i, future in enumerate(asyncio.as_completed(tasks), 1):
+            idx, result = await future
+            status = "ok" if result["success"] else result.get("error")
+            logger.info(" -> [%s/%s] %s: %s", i, len(tasks), result['paper_id'], status)
+            if result["success"] and result["extracted_info"]:
+                extracted[idx] = result["extracted_info"]
+        
+        return [extracted[idx] for idx in sorted(extracted)]
+    
     def get_results(self, query_id: str) -> dict:
         """get query results"""
         return self.queries.get(query_id)
@@ -191,29 +267,37 @@ class ResearchEngine:
     
     def add_paper(self, paper: dict, query_id: str = None) -> str:
         """add a new paper"""
-        import uuid
         paper_id = str(uuid.uuid4())
         
         if query_id and query_id in self.queries:
-            self.queries[query_id]["papers"].append({
+            papers = self.queries[query_id]["papers"]
+            papers.append({
                 "paper_id": paper_id,
                 **paper,
             })
+            self._paper_index[paper_id] = (query_id, len(papers) - 1)
         
         return paper_id
     
     def update_paper(self, paper_id: str, updates: dict):
         """update paper information"""
-        for query_results in self.queries.values():
-            for paper in query_results.get("papers", []):
-                if paper.get("paper_id") == paper_id:
-                    paper.update(updates)
+        location = self._paper_index.get(paper_id)
+        if location is None:
+            return
+        query_id, idx = location
+        self.queries[query_id]["papers"][idx].update(updates)
     
     def delete_paper(self, paper_id: str):
         """delete a paper by ID"""
-        for query_results in self.queries.values():
-            papers = query_results.get("papers", [])
-            query_results["papers"] = [p for p in papers if p.get("paper_id") != paper_id]
+        location = self._paper_index.pop(paper_id, None)
+        if location is None:
+            return
+        query_id, idx = location
+        papers = self.queries[query_id]["papers"]
+        del papers[idx]
+        # shift the positions of the papers after the deleted one
+        for pos in range(idx, len(papers)):
+            self._paper_index[papers[pos]["paper_id"]] = (query_id, pos)
     
     def get_summary(self, query_id: str) -> dict:
         """get comprehensive summary"""
@@ -230,6 +314,7 @@ def main():
     # initialize config
     config = get_config()
     config.validate()
+    setup_logging(logging.DEBUG if config.DEBUG else logging.INFO)
     
     # create research engine
     engine = ResearchEngine(config)
@@ -242,9 +327,9 @@ def main():
     app.register_blueprint(api)
     
     # run app
-    print(f"\n🚀 Start ML Research Copilot")
-    print(f"📍 access website: http://{config.HOST}:{config.PORT}")
-    print(f"🔧 Debug mode: {config.DEBUG}\n")
+    logger.info("\n🚀 Start ML Research Copilot")
+    logger.info("📍 access website: http://%s:%s", config.HOST, config.PORT)
+    logger.info("🔧 Debug mode: %s\n", config.DEBUG)
     
     app.run(
         host=config.HOST,
@@ -253,19 +338,25 @@ def main():
     )
 
 
-if __name__ == "__main__":
-    # for testing purposes
+async def main_async():
+    """run a test query through the async pipeline"""
     config = get_config()
+    setup_logging(logging.DEBUG if config.DEBUG else logging.INFO)
     engine = ResearchEngine(config)
     
     
     test_query = "deep-research 或者当前的AI联网搜索中，在拿到了目标网页之后，都是如何如何抽取有效信息组成答案的"
-    query_id = engine.process_query(test_query)
+    query_id = await engine.process_query_async(test_query)
     
     results = engine.get_results(query_id)
     if results:
-        print(f"\n📋 results summary:")
-        print(f"  status: {results.get('status')}")
-        print(f"  papers count: {len(results.get('papers', []))}")
+        logger.info("\n📋 results summary:")
+        logger.info("  status: %s", results.get('status'))
+        logger.info("  papers count: %s", len(results.get('papers', [])))
         if results.get('synthesis'):
-            print(f"  synthesis summary: {results['synthesis'].get('summary', '')[:100]}...")
+            logger.info("  synthesis summary: %s...", results['synthesis'].get('summary', '')[:100])
+
+
+if __name__ == "__main__":
+    # for testing purposes
+    asyncio.run(main_async())
@@ -2,18 +2,32 @@
 PDF 管理模块 - 处理论文 PDF 的下载、存储、缓存和解析
 """
 
-from .downloader import PDFDownloader, PDFDownloadError
-from .parser import PDFParser, PDFPage, PDFSection, ExtractedInfo
+from .downloader import PDFDownloader, PDFDownloadError, DownloadStats
+from .parser import (
+    PDFParser,
+    PDFPage,
+    PDFDocument,
+    PDFSection,
+    ExtractedInfo,
+    pages_to_table,
+    count_pages,
+    extract_page_range_text,
+)
 from .cache_manager import CacheManager, CacheMetadata
 from .pdf_processor import PDFProcessor
 
 __all__ = [
     "PDFDownloader",
     "PDFDownloadError",
+    "DownloadStats",
     "PDFParser",
     "PDFPage",
+    "PDFDocument",
     "PDFSection",
     "ExtractedInfo",
+    "pages_to_table",
+    "count_pages",
+    "extract_page_range_text",
     "CacheManager",
     "CacheMetadata",
     "PDFProcessor",
@@ -2,11 +2,25 @@
 PDF downloader - support download by parallel, retry and timeout
 """
 import os
-import requests
-from typing import Optional, Callable, Dict
+import time
+import zlib
+import functools
+import threading
+import importlib.util
+from typing import TYPE_CHECKING, Optional, Callable, Dict
 from pathlib import Path
+from dataclasses import dataclass, asdict
 from concurrent.futures import ThreadPoolExecutor, as_completed
-import time
+from .cache_manager import pdf_file_name
+
+if TYPE_CHECKING:
+    # imported lazily at runtime, see _create_session / _gather_all
+    import asyncio
+    import requests
+
+
+# HTTP statuses worth retrying; any other 4xx fails at once
+RETRY_STATUSES = (429, 500, 502, 503, 504)
 
 
 class PDFDownloadError(Exception):
@@ -14,6 +28,20 @@ class PDFDownloadError(Exception):
     pass
 
 
+class _TransientDownloadError(PDFDownloadError):
+    """connection dropped or timed out, possibly mid-body; worth another attempt"""
+    pass
+
+
+@dataclass
+class DownloadStats:
+    """download counters"""
+    total: int = 0
+    successful: int = 0
+    failed: int = 0
+    total_bytes: int = 0
+
+
 class PDFDownloader:
     """PDF downloader"""
     
@@ -31,7 +59,7 @@ class PDFDownloader:
         max_workers: int = 4,
         timeout: int = 30,
         max_retries: int = 3,
-        chunk_size: int = 8192,
+        chunk_size: int = 256 * 1024,
     ):
         """
         initailize PDF downloader
@@ -51,18 +79,60 @@ class PDFDownloader:
         self.max_retries = max_retries
         self.chunk_size = chunk_size
         
-        self.download_stats = {
-            "total": 0,
-            "successful": 0,
-            "failed": 0,
-            "total_bytes": 0,
-        }
+        self.download_stats = DownloadStats()
+        # download_paper runs on several threads at once
+        self._stats_lock = threading.Lock()
+        
+        # requests is imported and the session built on first download
+        self._session_obj = None
+        self._session_lock = threading.Lock()
+    
+    @property
+    def _session(self) -> "requests.Session":
+        """pooled session, created on first use"""
+        if self._session_obj is None:
+            with self._session_lock:
+                if self._session_obj is None:
+                    self._session_obj = self._create_session()
+        return self._session_obj
+    
+    def _create_session(self) -> "requests.Session":
+        """
+        create a pooled session shared by all download threads
+        
+        connections to the same host are kept alive and reused; transient
+        failures (connection errors, 429/5xx) are retried with exponential
+        backoff by the adapter
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        retry = Retry(
+            total=self.max_retries,
+            backoff_factor=1,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.max_workers,
+            pool_maxsize=self.max_workers * 2,
+            max_retries=retry,
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update(self.DEFAULT_HEADERS)
+        return session
     
     def download_paper(
         self,
         url: str,
         output_path: Optional[str] = None,
         progress_callback: Optional[Callable] = None,
+        etag: Optional[str] = None,
+        return_bytes: bool = False,
     ) -> Dict:
         """
         download PDF
@@ -71,6 +141,10 @@ class PDFDownloader:
             url: paper URL
             output_path: output dir (by url)
             progress_callback: progress callback
+            etag: ETag of the previously downloaded file; when given and the
+                file exists, it is revalidated with If-None-Match
+            return_bytes: also return the downloaded body as "content", so
+                callers can parse it without reading the file back
             
         Returns:
             Dict: download result
@@ -79,44 +153,60 @@ class PDFDownloader:
                     "url": str,
                     "file_path": str or None,
                     "file_size": int,
+                    "etag": str or None,
+                    "not_modified": bool,
+                    "content": bytes or None,
                     "error": str or None,
                 }
         """
         if output_path is None:
-            output_path = self._generate_output_path(url)
+            output_path = self._generate_output_path(str(self.download_dir), url)
         
         result = {
             "success": False,
             "url": url,
             "file_path": None,
             "file_size": 0,
+            "etag": etag,
+            "not_modified": False,
+            "content": None,
             "error": None,
         }
         
-        # if file exists, skip
-        if os.path.exists(output_path):
+        # if file exists and there is nothing to revalidate, skip
+        if os.path.exists(output_path) and not etag:
             result["success"] = True
             result["file_path"] = output_path
             result["file_size"] = os.path.getsize(output_path)
             return result
         
-        for attempt in range(self.max_retries):
+        # the session adapter retries failed connects, timeouts and 429/5xx
+        # responses; only a body stream that breaks or ends short is retried
+        # here, and the next attempt resumes from the .part file
+        for attempt in range(self.max_retries + 1):
             try:
-                result = self._download_with_retry(url, output_path, progress_callback)
+                result = self._download_with_retry(url, output_path, progress_callback, etag, return_bytes)
                 
                 if result["success"]:
-                    self.download_stats["successful"] += 1
-                    self.download_stats["total_bytes"] += result["file_size"]
+                    if not result["not_modified"]:
+                        self._record_success(result["file_size"])
                     return result
-                    
-            except PDFDownloadError as e:
+                break
+            
+            except _TransientDownloadError as e:
                 result["error"] = str(e)
-                if attempt < self.max_retries - 1:
-                    wait_time = 2 ** attempt  
+                if attempt < self.max_retries:
+                    wait_time = 2 ** attempt
                     print(f"download failed, {wait_time} seconds later retry: {str(e)}")
                     time.sleep(wait_time)
+                else:
+                    print(f"download failed: {str(e)}")
+            except PDFDownloadError as e:
+                result["error"] = str(e)
+                print(f"download failed: {str(e)}")
+                break
         
-        self.download_stats["failed"] += 1
+        self._record_failure()
         result["success"] = False
         return result
     
@@ -125,46 +215,130 @@ class PDFDownloader:
         url: str,
         output_path: str,
         progress_callback: Optional[Callable] = None,
+        etag: Optional[str] = None,
+        return_bytes: bool = False,
     ) -> Dict:
-        """download with retry"""
+        """
+        download with retry
+        
+        the body is streamed into "<output_path>.part" and renamed on
+        completion, so a failed transfer is resumed with a Range request
+        next time instead of starting over from byte 0
+        """
+        import requests
+        
+        part_path = output_path + ".part"
+        existing = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        
+        headers = {}
+        if existing:
+            headers['Range'] = f'bytes={existing}-'
+        if etag and os.path.exists(output_path):
+            headers['If-None-Match'] = etag
+        
         try:
-            response = requests.get(
+            response = self._session.get(
                 url,
-                headers=self.DEFAULT_HEADERS,
+                headers=headers,
                 timeout=self.timeout,
                 stream=True,
             )
+            
+            # unchanged since the last download
+            if response.status_code == 304:
+                response.close()
+                return {
+                    "success": True,
+                    "url": url,
+                    "file_path": output_path,
+                    "file_size": os.path.getsize(output_path),
+                    "etag": etag,
+                    "not_modified": True,
+                    "content": None,
+                    "error": None,
+                }
+            
+            # stale partial file, start over
+            if response.status_code == 416 and existing:
+                response.close()
+                os.remove(part_path)
+                return self._download_with_retry(url, output_path, progress_callback, etag, return_bytes)
+            
             response.raise_for_status()
             
-            # check if it's valid PDF
             content_type = response.headers.get('content-type', '').lower()
-            if 'pdf' not in content_type and response.content[:4] != b'%PDF':
-                raise PDFDownloadError(f"invalid PDF content type: {content_type}")
+            content_length = int(response.headers.get('content-length', 0))
             
-            # get total file size
-            total_size = int(response.headers.get('content-length', 0))
+            if response.status_code == 206:
+                # server honoured the Range header, append to the partial file
+                mode = 'ab'
+                header = b''
+                downloaded_size = existing
+                total_size = existing + content_length if content_length else 0
+            else:
+                # full body (server ignored Range or nothing to resume)
+                mode = 'wb'
+                downloaded_size = 0
+                total_size = content_length
+                
+                # check if it's valid PDF; peek the magic bytes instead of
+                # response.content, which would buffer the whole body
+                header = response.raw.read(4, decode_content=True)
+                if 'pdf' not in content_type and header != b'%PDF':
+                    response.close()
+                    raise PDFDownloadError(f"invalid PDF content type: {content_type}")
+            
+            # a resumed body is only the tail of the file, keep bytes for full bodies
+            chunks = [header] if return_bytes and mode == 'wb' else None
             
             # download file
-            downloaded_size = 0
-            with open(output_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=self.chunk_size):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded_size += len(chunk)
-                        
-                        # call progress callback
-                        if progress_callback and total_size > 0:
+            try:
+                with open(part_path, mode, buffering=1024 * 1024) as f:
+                    f.write(header)
+                    downloaded_size += len(header)
+                    body = response.iter_content(chunk_size=self.chunk_size)
+                    
+                    if progress_callback and total_size > 0:
+                        for chunk in body:
+                            f.write(chunk)
+                            downloaded_size += len(chunk)
+                            if chunks is not None:
+                                chunks.append(chunk)
+                            
+                            # call progress callback
                             progress_callback(downloaded_size, total_size)
+                    elif chunks is not None:
+                        for chunk in body:
+                            f.write(chunk)
+                            chunks.append(chunk)
+                    else:
+                        # common batch case: no bookkeeping per chunk
+                        for chunk in body:
+                            f.write(chunk)
+                    
+                    if total_size and f.tell() < total_size:
+                        raise _TransientDownloadError(
+                            f"truncated body: {f.tell()} of {total_size} bytes"
+                        )
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                # the connection broke mid-body; the adapter cannot retry that
+                raise _TransientDownloadError(f"download interrupted: {str(e)}")
+            
+            os.replace(part_path, output_path)
             
             return {
                 "success": True,
                 "url": url,
                 "file_path": output_path,
                 "file_size": os.path.getsize(output_path),
+                "etag": response.headers.get('ETag'),
+                "not_modified": False,
+                "content": b"".join(chunks) if chunks is not None else None,
                 "error": None,
             }
             
         except requests.RequestException as e:
+            # connect errors and timeouts were already retried by the adapter
             raise PDFDownloadError(f"request failed: {str(e)}")
         except IOError as e:
             raise PDFDownloadError(f"file writer failed: {str(e)}")
@@ -189,7 +363,8 @@ class PDFDownloader:
             Dict: download result stats
         """
         results = {}
-        self.download_stats["total"] = len(papers)
+        with self._stats_lock:
+            self.download_stats.total = len(papers)
         
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
             futures = {}
@@ -205,13 +380,13 @@ class PDFDownloader:
                     }
                     continue
                 
-                output_path = self._generate_output_path(url)
+                output_path = self._generate_output_path(str(self.download_dir), url, paper_id=paper_id)
                 
                 future = executor.submit(
                     self.download_paper,
                     url,
-                    output_path,
-                    progress_callback,
+                    output_path=output_path,
+                    progress_callback=progress_callback,
                 )
                 futures[future] = paper_id
             
@@ -228,30 +403,209 @@ class PDFDownloader:
                     }
         
         return {
-            "total": self.download_stats["total"],
-            "successful": self.download_stats["successful"],
-            "failed": self.download_stats["failed"],
-            "total_bytes": self.download_stats["total_bytes"],
+            **asdict(self.download_stats),
             "results": results,
         }
     
-    def _generate_output_path(self, url: str) -> str:
-        """generate output path"""
-        import hashlib
-        # generate hashlib as file name from URL name
-        url_hash = hashlib.md5(url.encode()).hexdigest()[:8]
-        filename = f"paper_{url_hash}.pdf"
+    def download_papers_batch_async(
+        self,
+        papers: list,
+        progress_callback: Optional[Callable] = None,
+    ) -> Dict:
+        """
+        download PDF by batch on a single event loop (aiohttp)
+        
+        same input/output as download_papers_batch; falls back to the
+        thread pool version when aiohttp is not installed
         
-        return str(self.download_dir / filename)
+        Args:
+            papers: paper list
+                [
+                    {"paper_id": "...", "url": "...", "output_path": "..." (optional)},
+                    ...
+                ]
+            progress_callback: progress callback
+            
+        Returns:
+            Dict: download result stats
+        """
+        if importlib.util.find_spec("aiohttp") is None:
+            print("Warning: aiohttp not installed, using threaded download")
+            return self.download_papers_batch(papers, progress_callback)
+        import asyncio
+        
+        with self._stats_lock:
+            self.download_stats.total = len(papers)
+        results = asyncio.run(self._gather_all(papers, progress_callback))
+        
+        return {
+            **asdict(self.download_stats),
+            "results": results,
+        }
+    
+    async def _gather_all(
+        self,
+        papers: list,
+        progress_callback: Optional[Callable] = None,
+    ) -> Dict:
+        """download all papers over one shared aiohttp session"""
+        import asyncio
+        import aiohttp
+        
+        results = {}
+        jobs = []
+        for paper in papers:
+            paper_id = paper.get("paper_id", "")
+            url = paper.get("url", "")
+            
+            if not url:
+                results[paper_id] = {
+                    "success": False,
+                    "error": "URL missing",
+                }
+                continue
+            
+            output_path = paper.get("output_path") or self._generate_output_path(
+                str(self.download_dir), url, paper_id=paper_id
+            )
+            jobs.append((paper_id, url, output_path))
+        
+        sem = asyncio.Semaphore(self.max_workers)
+        connector = aiohttp.TCPConnector(limit=self.max_workers, limit_per_host=self.max_workers)
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=self.timeout, sock_read=self.timeout)
+        
+        async with aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            headers=self.DEFAULT_HEADERS,
+        ) as session:
+            downloaded = await asyncio.gather(*(
+                self._adownload(url, output_path, session, sem, progress_callback)
+                for _, url, output_path in jobs
+            ))
+        
+        for (paper_id, _, _), result in zip(jobs, downloaded):
+            results[paper_id] = result
+        
+        return results
+    
+    async def _adownload(
+        self,
+        url: str,
+        output_path: str,
+        session,
+        sem: "asyncio.Semaphore",
+        progress_callback: Optional[Callable] = None,
+    ) -> Dict:
+        """download one PDF with aiohttp, retrying transient failures"""
+        import asyncio
+        import aiohttp
+        
+        result = {
+            "success": False,
+            "url": url,
+            "file_path": None,
+            "file_size": 0,
+            "error": None,
+        }
+        
+        # if file exists, skip
+        if os.path.exists(output_path):
+            result["success"] = True
+            result["file_path"] = output_path
+            result["file_size"] = os.path.getsize(output_path)
+            return result
+        
+        async with sem:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    async with session.get(url) as response:
+                        if response.status in RETRY_STATUSES and attempt < self.max_retries:
+                            await asyncio.sleep(2 ** attempt)
+                            continue
+                        response.raise_for_status()
+                        
+                        content_type = response.headers.get('content-type', '').lower()
+                        total_size = int(response.headers.get('content-length', 0))
+                        
+                        downloaded_size = 0
+                        # the body lands in "<output_path>.part" and is renamed when
+                        # complete, so the exists-check never sees a truncated PDF
+                        part_path = output_path + ".part"
+                        try:
+                            # chunks are small, plain buffered writes do not stall the loop;
+                            # the 1 MiB buffer turns ~16 chunks into one write() syscall
+                            with open(part_path, 'wb', buffering=1024 * 1024) as f:
+                                async for chunk in response.content.iter_chunked(64 * 1024):
+                                    if downloaded_size == 0 and 'pdf' not in content_type \
+                                            and not chunk.startswith(b'%PDF'):
+                                        raise PDFDownloadError(f"invalid PDF content type: {content_type}")
+                                    f.write(chunk)
+                                    downloaded_size += len(chunk)
+                                    
+                                    if progress_callback and total_size > 0:
+                                        progress_callback(downloaded_size, total_size)
+                            os.replace(part_path, output_path)
+                        except BaseException:
+                            # failed, timed out or cancelled mid-body
+                            if os.path.exists(part_path):
+                                os.remove(part_path)
+                            raise
+                    
+                    result["success"] = True
+                    result["file_path"] = output_path
+                    result["file_size"] = os.path.getsize(output_path)
+                    self._record_success(result["file_size"])
+                    return result
+                
+                except aiohttp.ClientResponseError as e:
+                    # an HTTP error status (404, 403, ...), or a retryable one
+                    # that is still failing after the last attempt
+                    result["error"] = f"request failed: {str(e)}"
+                    break
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    # connection errors and timeouts
+                    result["error"] = f"request failed: {str(e)}"
+                    if attempt < self.max_retries:
+                        await asyncio.sleep(2 ** attempt)
+                except PDFDownloadError as e:
+                    result["error"] = str(e)
+                    break
+                except IOError as e:
+                    result["error"] = f"file writer failed: {str(e)}"
+                    break
+        
+        print(f"download failed: {result['error']}")
+        self._record_failure()
+        return result
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=65536)
+    def _generate_output_path(download_dir_str: str, url: str, paper_id: Optional[str] = None) -> str:
+        """generate output path, named like the cache names it (paper_id if given, else crc32 of the URL)"""
+        return str(Path(download_dir_str) / pdf_file_name(paper_id or f"{zlib.crc32(url.encode()):08x}"))
+    
+    def _record_success(self, file_size: int):
+        """count a finished download"""
+        with self._stats_lock:
+            self.download_stats.successful += 1
+            self.download_stats.total_bytes += file_size
+    
+    def _record_failure(self):
+        """count a failed download"""
+        with self._stats_lock:
+            self.download_stats.failed += 1
     
     def get_download_stats(self) -> Dict:
         """get download stats"""
+        with self._stats_lock:
+            stats = asdict(self.download_stats)
         return {
-            **self.download_stats,
+            **stats,
             "success_rate": (
-                self.download_stats["successful"] / self.download_stats["total"]
-                if self.download_stats["total"] > 0
+                stats["successful"] / stats["total"]
+                if stats["total"] > 0
                 else 0
             ),
-            "total_size_mb": self.download_stats["total_bytes"] / (1024 * 1024),
+            "total_size_mb": stats["total_bytes"] / (1024 * 1024),
         }
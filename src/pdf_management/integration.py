@@ -1,32 +1,64 @@
 """
 PDF Integration Adapter - Integrates PDF processing into the main workflow
 """
+import os
+import copy
+import threading
+from collections import OrderedDict
+from collections import defaultdict
 from typing import List, Dict, Optional
-from src.core.types import StructuredPaper
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from src.pdf_management import PDFProcessor, ExtractedInfo
+from src.pdf_management.parser import (
+    PARALLEL_PAGE_THRESHOLD,
+    count_pages,
+    extract_page_range_text,
+)
+
+# section texts stored in pdf_content are cut to this length once
+SECTION_MAX_CHARS = 2000
+
+# key of a paper's PDF url; the one PDFProcessor downloads from
+PDF_URL_KEY = "pdf_url"
+
+# keys enrich_paper_with_pdf adds to a paper
+_ENRICHMENT_KEYS = ("pdf_content", "pdf_path", "pdf_processed", "pdf_error")
+
+# extracted full texts kept in memory, keyed by (pdf_path, mtime_ns)
+TEXT_CACHE_SIZE = 512
 
 
 class PDFIntegrationAdapter:
     """PDF Integration Adapter - Connects PDF processing with the main workflow"""
     
-    def __init__(self, llm_client=None, cache_dir: str = "./cache/pdfs"):
+    def __init__(self, llm_client=None, cache_dir: str = "./cache/pdfs", max_workers: int = 4):
         """
         Initializes the integration adapter
         
         Args:
             llm_client: LLM client
             cache_dir: PDF cache directory
+            max_workers: Number of papers enriched concurrently
         """
         self.processor = PDFProcessor(
             cache_dir=cache_dir,
             llm_client=llm_client,
+            max_workers=max_workers,
         )
         self.llm_client = llm_client
+        self.max_workers = max_workers
+        
+        # created on first large PDF, reused across calls
+        self._page_pool: Optional[ProcessPoolExecutor] = None
+        self._page_pool_lock = threading.Lock()
+        self._text_cache: "OrderedDict[tuple, str]" = OrderedDict()
+        self._text_cache_lock = threading.Lock()
     
     def enrich_paper_with_pdf(
         self,
         paper: Dict,
         extract_pdf: bool = True,
+        include_full_text: bool = False,
     ) -> Dict:
         """
         Enriches paper information with PDF content
@@ -34,31 +66,39 @@ class PDFIntegrationAdapter:
         Args:
             paper: Paper dictionary
             extract_pdf: Whether to extract PDF content
+            include_full_text: Whether to add the whole document text as
+                pdf_content["full_text"]; most consumers only need the sections
             
         Returns:
             Dict: Enriched paper information
         """
-        if not extract_pdf or not paper.get("url"):
+        return self._enrich(paper, extract_pdf, include_full_text, in_pool=False)
+    
+    def _enrich(self, paper: Dict, extract_pdf: bool, include_full_text: bool, in_pool: bool) -> Dict:
+        """enrich_paper_with_pdf; in_pool sends every text extraction to the process pool"""
+        if not extract_pdf or not paper.get(PDF_URL_KEY):
             return paper
         
         try:
             # Process PDF
-            result = self.processor.process_paper(paper)
+            # keep the downloaded body so the full text is parsed from memory
+            result = self.processor.process_paper(paper, PDF_URL_KEY, return_bytes=include_full_text)
             
             if result["success"]:
                 extracted = result.get("extracted_info")
                 
                 # Update paper information with PDF content
                 paper["pdf_content"] = {
-                    "full_text": self._extract_text_from_pdf(result["pdf_path"]),
                     "sections": {
-                        "abstract": extracted.abstract if extracted else "",
-                        "methodology": extracted.methodology if extracted else "",
-                        "results": extracted.results if extracted else "",
-                        "conclusion": extracted.conclusion if extracted else "",
+                        "abstract": (extracted.abstract or "")[:SECTION_MAX_CHARS] if extracted else "",
+                        "methodology": (extracted.methodology or "")[:SECTION_MAX_CHARS] if extracted else "",
+                        "results": (extracted.results or "")[:SECTION_MAX_CHARS] if extracted else "",
+                        "conclusion": (extracted.conclusion or "")[:SECTION_MAX_CHARS] if extracted else "",
                     },
                     "citations": result.get("citations", []),
                 }
+                if include_full_text:
+                    paper["pdf_content"]["full_text"] = self._full_text(result, in_pool)
                 paper["pdf_path"] = result["pdf_path"]
                 paper["pdf_processed"] = True
             else:
@@ -73,6 +113,7 @@ class PDFIntegrationAdapter:
         self,
         papers: List[Dict],
         extract_pdf: bool = True,
+        include_full_text: bool = False,
     ) -> List[Dict]:
         """
         Enriches paper information in batch
@@ -80,36 +121,165 @@ class PDFIntegrationAdapter:
         Args:
             papers: List of papers
             extract_pdf: Whether to extract PDF content
+            include_full_text: Whether to add pdf_content["full_text"]
             
         Returns:
             List[Dict]: List of enriched papers
         """
-        enriched = []
+        enriched = [None] * len(papers)
+        
+        # papers sharing a PDF are processed once, keyed like the PDF cache
+        groups = defaultdict(list)
+        for idx, paper in enumerate(papers):
+            url = paper.get(PDF_URL_KEY)
+            key = self.processor.get_paper_id(url) if url else idx
+            groups[key].append(idx)
         
-        for paper in papers:
-            enriched_paper = self.enrich_paper_with_pdf(paper, extract_pdf)
-            enriched.append(enriched_paper)
+        # fetch all missing PDFs up front on one event loop
+        if extract_pdf:
+            self.processor.prefetch_pdfs([paper for paper in papers if paper.get(PDF_URL_KEY)], PDF_URL_KEY)
+        
+        # the rest is cache lookups, parsing and LLM calls; threads overlap the
+        # I/O while full-text extraction runs in the process pool, since it
+        # holds the GIL. Cache metadata updates are serialized inside CacheManager
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self._enrich, papers[indices[0]], extract_pdf, include_full_text, True): indices
+                for indices in groups.values()
+            }
+            for future in as_completed(futures):
+                indices = futures[future]
+                result = future.result()
+                enriched[indices[0]] = result
+                
+                # broadcast the enrichment to the duplicates
+                for idx in indices[1:]:
+                    paper = papers[idx]
+                    for key in _ENRICHMENT_KEYS:
+                        if key in result:
+                            paper[key] = copy.copy(result[key])
+                    enriched[idx] = paper
         
         return enriched
     
-    @staticmethod
-    def _extract_text_from_pdf(pdf_path: str) -> str:
-        """Extracts all text from PDF"""
+    def _get_page_pool(self) -> ProcessPoolExecutor:
+        """Returns the shared page extraction process pool"""
+        with self._page_pool_lock:
+            if self._page_pool is None:
+                self._page_pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+            return self._page_pool
+    
+    def _full_text(self, result: Dict, in_pool: bool) -> str:
+        """Full text of a processed paper, reusing the text the processor already parsed"""
+        if result.get("full_text") is not None:
+            self._remember_text(result["pdf_path"], result["full_text"])
+            return result["full_text"]
+        return self._extract_text_from_pdf(
+            result["pdf_path"], pdf_bytes=result.get("pdf_bytes"), in_pool=in_pool
+        )
+    
+    def _cache_text(self, key: tuple, text: str):
+        """Puts text into the in-memory LRU"""
+        with self._text_cache_lock:
+            self._text_cache[key] = text
+            self._text_cache.move_to_end(key)
+            while len(self._text_cache) > TEXT_CACHE_SIZE:
+                self._text_cache.popitem(last=False)
+    
+    def _remember_text(self, pdf_path: str, text: str, mtime_ns: Optional[int] = None):
+        """Stores extracted text in the in-memory LRU and the on-disk sidecar"""
+        try:
+            if mtime_ns is None:
+                mtime_ns = os.stat(pdf_path).st_mtime_ns
+        except OSError:
+            return
+        
+        self._cache_text((pdf_path, mtime_ns), text)
+        
+        sidecar = pdf_path + ".txt"
         try:
-            import PyPDF2
+            with open(sidecar, 'w', encoding='utf-8') as f:
+                f.write(text)
+        except OSError as e:
+            print(f"Warning: could not write text cache {sidecar}: {e}")
+    
+    def _extract_text_from_pdf(
+        self,
+        pdf_path: str,
+        pdf_bytes: Optional[bytes] = None,
+        in_pool: bool = False,
+    ) -> str:
+        """
+        Extracts all text from PDF (PyMuPDF if installed, else pypdf/PyPDF2)
+        
+        The text is cached in memory by (pdf_path, mtime) and in a
+        "<pdf_path>.txt" sidecar that is reused while it is newer than the PDF.
+        
+        Args:
+            pdf_path: PDF file path
+            pdf_bytes: PDF body already in memory (just downloaded); parsed
+                directly instead of reading the file back
+            in_pool: extract small documents in the process pool too, so
+                concurrent callers do not serialize on the GIL
+        """
+        try:
+            mtime_ns = os.stat(pdf_path).st_mtime_ns
+            key = (pdf_path, mtime_ns)
+            with self._text_cache_lock:
+                if key in self._text_cache:
+                    self._text_cache.move_to_end(key)
+                    return self._text_cache[key]
             
-            text = []
-            with open(pdf_path, 'rb') as f:
-                pdf_reader = PyPDF2.PdfReader(f)
-                
-                for page in pdf_reader.pages:
-                    text.append(page.extract_text())
+            sidecar = pdf_path + ".txt"
+            try:
+                if os.stat(sidecar).st_mtime_ns >= mtime_ns:
+                    with open(sidecar, 'r', encoding='utf-8') as f:
+                        text = f.read()
+                    self._cache_text(key, text)
+                    return text
+            except OSError:
+                pass
             
-            return "\n".join(text)
+            text = self._extract_text_uncached(pdf_path, pdf_bytes, in_pool)
+            self._remember_text(pdf_path, text, mtime_ns)
+            return text
         
         except Exception as e:
             return f"[PDF text extraction failed: {e}]"
     
+    def _extract_text_uncached(
+        self,
+        pdf_path: str,
+        pdf_bytes: Optional[bytes] = None,
+        in_pool: bool = False,
+    ) -> str:
+        """Extracts all text from PDF, bypassing the sidecar cache"""
+        if pdf_bytes and not in_pool:
+            # just downloaded: small documents are parsed straight from memory
+            n_pages = count_pages(pdf_bytes)
+            if n_pages <= PARALLEL_PAGE_THRESHOLD:
+                return extract_page_range_text(pdf_bytes)
+        else:
+            n_pages = count_pages(pdf_path)
+        
+        n_procs = os.cpu_count() or 1
+        
+        if n_pages <= PARALLEL_PAGE_THRESHOLD or n_procs < 2:
+            if in_pool:
+                return self._get_page_pool().submit(extract_page_range_text, pdf_path, 0, n_pages).result()
+            return extract_page_range_text(pdf_path, 0, n_pages)
+        
+        # pages are independent, extract ranges on all cores
+        step = -(-n_pages // n_procs)
+        starts = range(0, n_pages, step)
+        parts = self._get_page_pool().map(
+            extract_page_range_text,
+            [pdf_path] * len(starts),
+            starts,
+            [lo + step for lo in starts],
+        )
+        return "\n".join(parts)
+    
     def generate_synthesis_from_pdf(
         self,
         paper: Dict,
@@ -131,23 +301,68 @@ class PDFIntegrationAdapter:
         if not paper.get("pdf_content"):
             return "Paper PDF content not available"
         
-        pdf_content = paper["pdf_content"]
+        prompt = self._build_synthesis_prompt(paper, synthesis_prompt)
+        
+        try:
+            response = self.llm_client.call(prompt)
+            return response
+        except Exception as e:
+            return f"Generation failed: {e}"
+    
+    def generate_synthesis_batch(
+        self,
+        papers: List[Dict],
+        synthesis_prompt: Optional[str] = None,
+        concurrency: int = 8,
+    ) -> List[str]:
+        """
+        Generates summaries for many papers with concurrent LLM calls
+        
+        Args:
+            papers: Paper dictionaries (must include pdf_content)
+            synthesis_prompt: Synthesis prompt
+            concurrency: Max LLM requests in flight
+            
+        Returns:
+            List[str]: One summary per paper, in input order
+        """
+        if not self.llm_client:
+            return ["LLM client not configured"] * len(papers)
+        
+        summaries = ["Paper PDF content not available"] * len(papers)
+        indices = [i for i, paper in enumerate(papers) if paper.get("pdf_content")]
+        prompts = [self._build_synthesis_prompt(papers[i], synthesis_prompt) for i in indices]
+        
+        try:
+            responses = self.llm_client.call_batch(prompts, concurrency=concurrency)
+        except Exception as e:
+            responses = [f"Generation failed: {e}"] * len(prompts)
+        
+        for i, response in zip(indices, responses):
+            summaries[i] = response
+        return summaries
+    
+    @staticmethod
+    def _build_synthesis_prompt(paper: Dict, synthesis_prompt: Optional[str] = None) -> str:
+        """Builds the synthesis prompt for one paper"""
+        # section texts are already cut to SECTION_MAX_CHARS when they are stored
+        sections = paper["pdf_content"].get("sections", {})
         
         # Prepare content
         content_text = f"""
 Paper Title: {paper.get('title', 'N/A')}
 
 Abstract:
-{pdf_content.get('sections', {}).get('abstract', '')[:500]}
+{sections.get('abstract', '')}
 
 Methodology:
-{pdf_content.get('sections', {}).get('methodology', '')[:500]}
+{sections.get('methodology', '')}
 
 Main Results:
-{pdf_content.get('sections', {}).get('results', '')[:500]}
+{sections.get('results', '')}
 
 Conclusion:
-{pdf_content.get('sections', {}).get('conclusion', '')[:500]}
+{sections.get('conclusion', '')}
 """
         
         # Generate prompt
@@ -161,18 +376,20 @@ Conclusion:
 
 Please answer in English, summary length 200-300 words."""
         
-        prompt = f"""{synthesis_prompt}
+        return f"""{synthesis_prompt}
 
 Paper Content:
 {content_text}
 """
-        
-        try:
-            response = self.llm_client.call(prompt)
-            return response
-        except Exception as e:
-            return f"Generation failed: {e}"
     
     def get_cache_stats(self) -> Dict:
         """Gets cache statistics"""
         return self.processor.get_cache_stats()
+    
+    def close(self):
+        """Shuts down the page extraction process pools"""
+        with self._page_pool_lock:
+            if self._page_pool is not None:
+                self._page_pool.shutdown()
+                self._page_pool = None
+        self.processor.parser.close()
@@ -1,8 +1,235 @@
 """
 PDF Parser - Supports text extraction, segmentation, and metadata parsing.
 """
-from typing import List, Dict, Optional, Tuple
-from dataclasses import dataclass
+import io
+import os
+import re
+import mmap
+import asyncio
+import contextlib
+import json
+import shutil
+import functools
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Dict, Iterable, Iterator, Optional, Tuple, Union
+from dataclasses import dataclass, asdict
+from .cache_manager import CacheManager
+from src.utils import atomic_write, json_dumps, json_loads
+
+if TYPE_CHECKING:
+    # imported lazily at runtime, see PDFDocument.from_pages
+    import numpy as np
+
+# a PDF file path, or the PDF itself already in memory (e.g. a mmap of the file)
+PDFInput = Union[str, os.PathLike, bytes, bytearray, memoryview, mmap.mmap]
+
+
+def _is_buffer(pdf: PDFInput) -> bool:
+    """True if a PDF input is an in-memory buffer rather than a path"""
+    return not isinstance(pdf, (str, os.PathLike))
+
+
+class _BufferReader(io.RawIOBase):
+    """Seekable read-only file over an in-memory PDF; reads copy only the requested chunk"""
+
+    def __init__(self, buf: PDFInput):
+        self._view = memoryview(buf).cast("B")
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        n = max(0, min(len(b), len(self._view) - self._pos))
+        b[:n] = self._view[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._view)}[whence]
+        if base + offset < 0:
+            raise ValueError("negative seek position")
+        self._pos = base + offset
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def close(self):
+        # an exported view keeps a mmap from being closed
+        self._view.release()
+        super().close()
+
+
+# text extraction backends in the order PDFParser(backend="auto") tries them
+PDF_BACKENDS = ("pdftotext", "pymupdf", "pdfium", "pypdf")
+_BACKEND_ALIASES = {"fitz": "pymupdf", "pypdfium2": "pdfium", "pypdf2": "pypdf"}
+
+# bump when a backend's output or the PDFPage schema changes, so cached
+# pages (PDFParser(cache_dir=...)) are no longer reused
+PAGES_CACHE_VERSION = 1
+
+# extracted page lists kept in memory per parser, keyed like the disk cache
+PAGES_MEMORY_CACHE_SIZE = 32
+
+# documents with more pages than this are extracted in parallel page ranges
+PARALLEL_PAGE_THRESHOLD = 32
+
+# worker processes of a parser's page extraction pool
+PAGE_WORKERS = min(4, os.cpu_count() or 1)
+
+# fields the section-title lookup must fill, with at least this many
+# characters each, before extract_key_information skips the LLM
+LOCAL_REQUIRED_FIELDS = ("abstract", "methodology", "results", "conclusion")
+LOCAL_MIN_CHARS = 200
+
+# EXTRACTION_FIELDS keys no section title supplies; for a locally complete
+# paper the LLM is asked for these only, a much shorter response
+LOCAL_GAP_FIELDS = ("authors", "objective", "datasets", "models", "evaluation", "limitations")
+
+# length of PDFSection.content_preview, what _find_section hands out
+SECTION_PREVIEW_CHARS = 1000
+
+# substring match on purpose (no \b), same as the old `title in text` check,
+# so "Conclusions" or "2. Methods" still count as section titles
+_SECTION_RE = re.compile(
+    r"abstract|introduction|method|results|discussion|conclusion"
+    r"|references|acknowledgments|appendix|related work",
+    re.IGNORECASE,
+)
+
+
+# keys the extraction prompt asks the LLM for, with their descriptions
+EXTRACTION_FIELDS = {
+    "title": "Paper title",
+    "authors": "Authors, separated by ;",
+    "abstract": "Abstract",
+    "objective": "Research objective",
+    "methodology": "Research methodology, including steps",
+    "datasets": "Datasets, if any",
+    "models": "Models used, if any",
+    "evaluation": "Evaluation approach and metrics, if any",
+    "results": "Main results and conclusion",
+    "contributions": "Key contributions and innovation",
+    "limitations": "Limitations",
+}
+
+# sections (first N characters each) shown to the LLM
+PROMPT_SECTIONS = 5
+PROMPT_SECTION_CHARS = 100
+
+# llm_client.call() arguments of the key information extraction
+_EXTRACTION_LLM_KWARGS = {"max_tokens": 10240, "temperature": 0.3, "output_format": "json"}
+
+# tags of the LLM extraction response, the fallback when it is not JSON
+# (see _extract_with_llm / _parse_extraction_response)
+_EXTRACTION_TAG_RE = re.compile(
+    r"<(title|authors|abstract|objective|methodology|datasets|models"
+    r"|evaluation|results|contributions|limitations)>(.*?)</\1>",
+    re.DOTALL | re.IGNORECASE,
+)
+
+
+# a references-section line that looks like a citation: starts with a digit,
+# "(" or "[", or contains a comma and is longer than 20 characters
+_CITATION_LINE_RE = re.compile(
+    r"^(?:[\d¹²³⁴⁵⁶⁷⁸⁹⁰(\[].*|(?=[^\n]*,).{21,})$",
+    re.MULTILINE,
+)
+
+
+# references heading, optionally numbered ("7. REFERENCES", "VII. Bibliography"),
+# after Powley & Dale's reference-section cascade
+_REFERENCES_HEADING_RE = re.compile(
+    r"^\s*(?:\d{0,2}\s*[IVX]{0,4})\.?\s*(?:references|bibliograph(?:y|ie))\b",
+    re.IGNORECASE,
+)
+
+
+# the same heading anywhere in a page's text, one search per page
+_REFERENCES_HEADING_LINE_RE = re.compile(
+    r"^[ \t]*(?:\d{0,2}[ \t]*[IVX]{0,4})\.?[ \t]*(?:references|bibliograph(?:y|ie))\b",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+# appendix heading ("Appendix", "A. Appendix", "Supplementary Material"),
+# which ends the references section
+_APPENDIX_HEADING_RE = re.compile(
+    r"^\s*(?:[A-Z]\.?\s+)?(?:appendix|appendices|supplementary)\b",
+    re.IGNORECASE,
+)
+
+
+def _is_references_heading(line: str) -> bool:
+    """Whether a line opens the references section"""
+    return _REFERENCES_HEADING_RE.match(line) is not None
+
+
+def _is_appendix_heading(line: str) -> bool:
+    """Whether a line opens an appendix or supplementary section"""
+    return _APPENDIX_HEADING_RE.match(line) is not None
+
+
+# backend probes are resolved once per process on first use, not per call and
+# not at import time (keeps `import src.pdf_management` cheap)
+@functools.lru_cache(maxsize=None)
+def _import_pymupdf():
+    """Returns the PyMuPDF module, or None when it is not installed"""
+    try:
+        import pymupdf
+        return pymupdf
+    except ImportError:
+        try:
+            import fitz
+            return fitz
+        except ImportError:
+            return None
+
+
+# PDFium is not thread-safe: every pypdfium2 call in a process goes through this
+_PDFIUM_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def _import_pdfium():
+    """Returns pypdfium2 (PDFium C++ engine), or None when it is not installed"""
+    try:
+        import pypdfium2
+        return pypdfium2
+    except ImportError:
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def _import_pdf_reader():
+    """Returns the pure-Python reader module (pypdf, else the deprecated PyPDF2), or None"""
+    try:
+        import pypdf
+        return pypdf
+    except ImportError:
+        try:
+            import PyPDF2
+            return PyPDF2
+        except ImportError:
+            return None
+
+
+@functools.lru_cache(maxsize=None)
+def _import_pyarrow():
+    """Returns the pyarrow module, or None when it is not installed"""
+    try:
+        import pyarrow
+        return pyarrow
+    except ImportError:
+        return None
 
 
 @dataclass
@@ -13,6 +240,237 @@ class PDFPage:
     metadata: Dict = None
 
 
+def _pdfium_page_text(pdf, index: int, with_metadata: bool = False) -> Tuple[str, Optional[Dict]]:
+    """Text and, if asked, metadata of one pypdfium2 page (hold _PDFIUM_LOCK); handles are closed right away"""
+    page = pdf[index]
+    try:
+        textpage = page.get_textpage()
+        try:
+            # PDFium separates lines with CRLF
+            text = textpage.get_text_range().replace("\r\n", "\n")
+        finally:
+            textpage.close()
+        if not with_metadata:
+            return text, None
+        return text, {"rotation": page.get_rotation(), "media_box": tuple(page.get_mediabox())}
+    finally:
+        page.close()
+
+
+def _pymupdf_open(pymupdf, pdf_path: PDFInput):
+    """Opens a PDF path or buffer with PyMuPDF, handing buffers over without a copy where it can"""
+    if not _is_buffer(pdf_path):
+        return pymupdf.open(pdf_path)
+    try:
+        return pymupdf.open(stream=pdf_path, filetype="pdf")
+    except TypeError:
+        # releases that only take bytes / BytesIO as the stream
+        return pymupdf.open(stream=bytes(pdf_path), filetype="pdf")
+
+
+def _pymupdf_page_range(pdf_path: PDFInput, lo: int, hi: int, with_metadata: bool = False) -> List[PDFPage]:
+    """Extracts pages [lo, hi) with PyMuPDF; module level so it can run in a worker process"""
+    pymupdf = _import_pymupdf()
+    doc = _pymupdf_open(pymupdf, pdf_path)
+    try:
+        pages = []
+        for i in range(lo, min(hi, len(doc))):
+            page = doc[i]
+            pages.append(PDFPage(
+                page_number=i + 1,
+                text=page.get_text("text"),
+                metadata={
+                    "rotation": page.rotation,
+                    "media_box": tuple(page.rect),
+                } if with_metadata else None,
+            ))
+        return pages
+    finally:
+        doc.close()
+
+
+def _pdfium_input(pdf_path: PDFInput):
+    """Context manager giving pypdfium2 a path, bytes in place, or a readinto stream over other buffers (mmap lacks one)"""
+    if _is_buffer(pdf_path) and not isinstance(pdf_path, bytes):
+        return _BufferReader(pdf_path)
+    return contextlib.nullcontext(pdf_path)
+
+
+def _join_pages(texts: Iterable[Optional[str]]) -> str:
+    """Joins page texts with newlines, writing them into one buffer as they are produced"""
+    buf = io.StringIO()
+    for i, text in enumerate(texts):
+        if i:
+            buf.write("\n")
+        buf.write(text or "")
+    return buf.getvalue()
+
+
+def count_pages(pdf_path: PDFInput) -> int:
+    """
+    Page count of a PDF (PyMuPDF, else pypdfium2, else pypdf/PyPDF2)
+    
+    Args:
+        pdf_path: PDF file path, or its content as bytes / mmap
+        
+    Returns:
+        int: number of pages
+    """
+    pymupdf = _import_pymupdf()
+    if pymupdf is not None:
+        doc = _pymupdf_open(pymupdf, pdf_path)
+        try:
+            return len(doc)
+        finally:
+            doc.close()
+    
+    pdfium = _import_pdfium()
+    if pdfium is not None:
+        with _pdfium_input(pdf_path) as pdf_input, _PDFIUM_LOCK:
+            pdf = pdfium.PdfDocument(pdf_input)
+            try:
+                return len(pdf)
+            finally:
+                pdf.close()
+    
+    pdf_lib = _import_pdf_reader()
+    with (_BufferReader(pdf_path) if _is_buffer(pdf_path) else open(pdf_path, 'rb')) as f:
+        return len(pdf_lib.PdfReader(f).pages)
+
+
+def extract_page_range_text(pdf_path: PDFInput, lo: int = 0, hi: Optional[int] = None) -> str:
+    """
+    Plain text of pages [lo, hi) joined with newlines, without page metadata
+    
+    Module level so that page ranges of one document can be extracted in
+    worker processes (pass a path there; buffers are for in-process use).
+    
+    Args:
+        pdf_path: PDF file path, or its content as bytes / mmap
+        lo: first page index
+        hi: end page index (exclusive), None for the last page
+        
+    Returns:
+        str: text of the pages
+    """
+    pymupdf = _import_pymupdf()
+    if pymupdf is not None:
+        # plain searchable text, skip ligature preservation
+        flags = pymupdf.TEXTFLAGS_TEXT & ~pymupdf.TEXT_PRESERVE_LIGATURES
+        doc = _pymupdf_open(pymupdf, pdf_path)
+        try:
+            end = len(doc) if hi is None else min(hi, len(doc))
+            return _join_pages(doc[i].get_text(flags=flags) for i in range(lo, end))
+        finally:
+            doc.close()
+    
+    pdfium = _import_pdfium()
+    if pdfium is not None:
+        with _pdfium_input(pdf_path) as pdf_input, _PDFIUM_LOCK:
+            pdf = pdfium.PdfDocument(pdf_input)
+            try:
+                end = len(pdf) if hi is None else min(hi, len(pdf))
+                return _join_pages(_pdfium_page_text(pdf, i)[0] for i in range(lo, end))
+            finally:
+                pdf.close()
+    
+    pdf_lib = _import_pdf_reader()
+    with (_BufferReader(pdf_path) if _is_buffer(pdf_path) else open(pdf_path, 'rb')) as f:
+        pages = pdf_lib.PdfReader(f).pages
+        end = len(pages) if hi is None else min(hi, len(pages))
+        return _join_pages(pages[i].extract_text() for i in range(lo, end))
+
+
+def pages_to_table(pages: Iterable[PDFPage]):
+    """
+    Packs pages into a columnar pyarrow table for bulk, vectorized scans
+    
+    Columns are page_number (int32) and text (large_string), plus rotation
+    (int16) when the pages carry metadata (PDFParser(with_metadata=True));
+    e.g. pyarrow.compute.match_substring_regex(table["text"], ...) finds
+    section titles across a whole batch without a Python loop. pyarrow is
+    an optional dependency (pip install ml-research-copilot[arrow]).
+    
+    Args:
+        pages: PDF pages (a list, or the iter_pages generator)
+        
+    Returns:
+        pyarrow.Table, or None when pyarrow is not installed
+    """
+    pa = _import_pyarrow()
+    if pa is None:
+        print("Warning: pyarrow not installed, cannot build a pages table")
+        return None
+    
+    page_numbers, texts, rotations = [], [], []
+    has_metadata = False
+    for page in pages:
+        page_numbers.append(page.page_number)
+        texts.append(page.text or "")
+        if page.metadata:
+            has_metadata = True
+            rotations.append(int(page.metadata.get("rotation", 0)))
+        else:
+            rotations.append(None)
+    
+    columns = {
+        "page_number": pa.array(page_numbers, type=pa.int32()),
+        "text": pa.array(texts, type=pa.large_string()),
+    }
+    # without metadata there is no rotation to report, not a column of zeros
+    if has_metadata:
+        columns["rotation"] = pa.array(rotations, type=pa.int16())
+    return pa.table(columns)
+
+
+@dataclass
+class PDFDocument:
+    """Pages of one PDF as parallel columns (struct of arrays)"""
+    page_numbers: "np.ndarray"  # int32
+    texts: List[str]
+    rotations: "np.ndarray"  # int16
+    media_boxes: List[Optional[tuple]]
+    
+    @classmethod
+    def from_pages(cls, pages: Iterable[PDFPage]) -> "PDFDocument":
+        """Builds the columns from PDFPage objects (a list, or the iter_pages generator)"""
+        import numpy as np
+        
+        page_numbers, texts, rotations, media_boxes = [], [], [], []
+        for page in pages:
+            metadata = page.metadata or {}
+            page_numbers.append(page.page_number)
+            texts.append(page.text or "")
+            rotations.append(int(metadata.get("rotation", 0)))
+            media_boxes.append(metadata.get("media_box"))
+        
+        return cls(
+            page_numbers=np.asarray(page_numbers, dtype=np.int32),
+            texts=texts,
+            rotations=np.asarray(rotations, dtype=np.int16),
+            media_boxes=media_boxes,
+        )
+    
+    def __len__(self) -> int:
+        return len(self.texts)
+    
+    def __iter__(self) -> Iterator[PDFPage]:
+        """PDFPage views, so parse_structure / parse_and_citations accept a document"""
+        for page_number, text, rotation, media_box in zip(
+            self.page_numbers.tolist(), self.texts, self.rotations.tolist(), self.media_boxes
+        ):
+            yield PDFPage(
+                page_number=page_number,
+                text=text,
+                metadata={"rotation": rotation, "media_box": media_box},
+            )
+    
+    @property
+    def full_text(self) -> str:
+        """Page texts joined by newlines"""
+        return "\n".join(self.texts)
+
+
 @dataclass
 class PDFSection:
     """PDF Section"""
@@ -21,6 +479,7 @@ class PDFSection:
     end_page: int
     content: str
     subsections: List["PDFSection"] = None
+    content_preview: str = ""  # first SECTION_PREVIEW_CHARS of content
 
 
 @dataclass
@@ -40,86 +499,452 @@ class ExtractedInfo:
     figures: List[Dict]
     tables: List[Dict]
     url: str = ""
+    conclusion: str = ""
+    
+    def to_dict(self) -> Dict:
+        """Convert to dictionary"""
+        return asdict(self)
+
+
+def _extract_pages_worker(
+    pdf_path: str,
+    backend: str,
+    cache_dir: Optional[str],
+    with_metadata: bool,
+) -> List[PDFPage]:
+    """extract_text in a worker process of extract_text_batch"""
+    parser = PDFParser(backend=backend, cache_dir=cache_dir, with_metadata=with_metadata)
+    # the batch already spreads documents over the cores
+    parser.page_workers = 1
+    return parser.extract_text(pdf_path)
+
+
+# module probe and PDFParser page iterator of each importable backend
+_BACKEND_READERS = {
+    "pymupdf": (_import_pymupdf, "_iter_pages_pymupdf"),
+    "pdfium": (_import_pdfium, "_iter_pages_pdfium"),
+    "pypdf": (_import_pdf_reader, "_iter_pages_reader"),
+}
 
 
 class PDFParser:
     """PDF Parser"""
     
-    def __init__(self, llm_client=None):
+    def __init__(
+        self,
+        llm_client=None,
+        backend: str = "auto",
+        cache_dir: Optional[str] = None,
+        with_metadata: bool = False,
+    ):
         """
         Initializes the PDF parser
         
         Args:
             llm_client: LLM client (for intelligent parsing)
+            backend: text extraction backend, one of PDF_BACKENDS ("fitz",
+                "pypdfium2" and "PyPDF2" are accepted as aliases), or "auto"
+                to use the first one that is available
+            cache_dir: directory for extracted pages, keyed by file content and
+                backend; None disables the cache
+            with_metadata: fill PDFPage.metadata (rotation, media box); off by
+                default since no caller in the pipeline reads it
         """
+        backend = backend.lower()
+        backend = _BACKEND_ALIASES.get(backend, backend)
+        if backend != "auto" and backend not in PDF_BACKENDS:
+            raise ValueError(f"Unknown PDF backend: {backend}")
+        self.backend = backend
+        self._backends = PDF_BACKENDS if backend == "auto" else (backend,)
         self.llm_client = llm_client
+        self.with_metadata = with_metadata
+        # Poppler's pdftotext binary, if installed, is the fastest plain-text path
+        self._pdftotext = shutil.which("pdftotext")
+        # worker processes for the page ranges of one large PDF
+        self.page_workers = PAGE_WORKERS
+        # created on the first large PDF, reused across calls
+        self._page_pool: Optional[ProcessPoolExecutor] = None
+        self._page_pool_lock = threading.Lock()
+        
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._pages_cache: "OrderedDict[str, List[PDFPage]]" = OrderedDict()
+        self._pages_cache_lock = threading.Lock()
     
-    def extract_text(self, pdf_path: str) -> List[PDFPage]:
+    def extract_text(self, pdf_path: PDFInput) -> List[PDFPage]:
         """
         Extracts text from a PDF
         
         Args:
-            pdf_path: PDF file path
+            pdf_path: PDF file path, or its content as bytes / mmap
             
         Returns:
             List[PDFPage]: List of PDF pages
         """
+        if self.cache_dir is None:
+            return list(self._iter_pages_uncached(pdf_path))
+        
         try:
-            import PyPDF2
-        except ImportError:
-            print("Warning: PyPDF2 not installed, using basic parsing")
-            return self._basic_text_extraction(pdf_path)
+            key = self._pages_cache_key(pdf_path)
+        except OSError as e:
+            print(f"PDF extraction failed: {e}")
+            return []
         
-        pages = []
+        with self._pages_cache_lock:
+            if key in self._pages_cache:
+                self._pages_cache.move_to_end(key)
+                return list(self._pages_cache[key])
         
+        cache_file = self.cache_dir / f"{key}.json"
+        pages = None
         try:
-            with open(pdf_path, 'rb') as f:
-                pdf_reader = PyPDF2.PdfReader(f)
+            pages = [PDFPage(**page) for page in json_loads(cache_file.read_bytes())]
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Warning: unreadable pages cache {cache_file}: {e}")
+        
+        if pages is None:
+            pages = list(self._iter_pages_uncached(pdf_path))
+            # an empty result usually means extraction failed, retry next time
+            if pages:
+                try:
+                    atomic_write(cache_file, json_dumps([asdict(page) for page in pages]))
+                except OSError as e:
+                    print(f"Warning: could not write pages cache {cache_file}: {e}")
+        
+        with self._pages_cache_lock:
+            self._pages_cache[key] = pages
+            self._pages_cache.move_to_end(key)
+            while len(self._pages_cache) > PAGES_MEMORY_CACHE_SIZE:
+                self._pages_cache.popitem(last=False)
+        return list(pages)
+    
+    def _pages_cache_key(self, pdf_path: PDFInput) -> str:
+        """Cache key of a PDF: content hash, the backend that would parse it and PAGES_CACHE_VERSION"""
+        if _is_buffer(pdf_path):
+            file_hash = CacheManager._calculate_buffer_hash(pdf_path)
+        else:
+            file_hash = CacheManager._calculate_file_hash(pdf_path)
+        meta = "-meta" if self.with_metadata else ""
+        return f"{file_hash}-{self._resolve_backend()}{meta}-v{PAGES_CACHE_VERSION}"
+    
+    def _resolve_backend(self) -> str:
+        """The first backend of this parser that is available"""
+        for backend in self._backends:
+            if backend == "pdftotext":
+                if self._pdftotext:
+                    return backend
+            elif _BACKEND_READERS[backend][0]() is not None:
+                return backend
+        return "none"
+    
+    def iter_pages(self, pdf_path: PDFInput) -> Iterator[PDFPage]:
+        """
+        Yields the pages of a PDF one at a time
+        
+        Use this over extract_text when the pages are scanned once (e.g. by
+        parse_structure), so only the current page is held in memory. With a
+        cache_dir the pages come from (and go to) the pages cache instead.
+        
+        Args:
+            pdf_path: PDF file path, or its content as bytes / mmap
+            
+        Returns:
+            Iterator[PDFPage]: PDF pages in order
+        """
+        if self.cache_dir is not None:
+            yield from self.extract_text(pdf_path)
+        else:
+            yield from self._iter_pages_uncached(pdf_path)
+    
+    def _iter_pages_uncached(self, pdf_path: PDFInput) -> Iterator[PDFPage]:
+        """Yields the pages of a PDF from the first available backend"""
+        for backend in self._backends:
+            if backend == "pdftotext":
+                if self._pdftotext:
+                    pages = self._extract_text_pdftotext(pdf_path)
+                    if pages:
+                        yield from pages
+                        return
+                continue
+            
+            probe, iter_name = _BACKEND_READERS[backend]
+            module = probe()
+            if module is not None:
+                yield from getattr(self, iter_name)(module, pdf_path)
+                return
+        
+        print(f"Warning: no PDF backend available ({', '.join(self._backends)}), using basic parsing")
+        yield from self._basic_text_extraction(pdf_path)
+    
+    def _iter_pages_reader(self, pdf_lib, pdf_path: PDFInput) -> Iterator[PDFPage]:
+        """Yields pages extracted with pypdf / PyPDF2 (pure Python)"""
+        with_metadata = self.with_metadata
+        try:
+            # buffers are read in place, the caller's mmap is left open
+            f = _BufferReader(pdf_path) if _is_buffer(pdf_path) else open(pdf_path, 'rb')
+            with f as stream:
+                pdf_reader = pdf_lib.PdfReader(stream)
                 
                 for page_num, page in enumerate(pdf_reader.pages, 1):
-                    text = page.extract_text()
-                    
-                    pages.append(PDFPage(
+                    yield PDFPage(
                         page_number=page_num,
-                        text=text,
+                        text=page.extract_text(),
                         metadata={
                             "rotation": page.get("/Rotate", 0),
-                            "media_box": page.mediabox,
-                        }
-                    ))
+                            # plain floats, so the page does not pin the reader
+                            "media_box": tuple(float(v) for v in page.mediabox),
+                        } if with_metadata else None,
+                    )
         
         except Exception as e:
             print(f"PDF extraction failed: {e}")
+    
+    def extract_text_batch(
+        self,
+        pdf_paths: List[str],
+        workers: Optional[int] = None,
+        use_threads: bool = False,
+    ) -> Dict[str, List[PDFPage]]:
+        """
+        Extracts text from many PDFs in parallel
         
-        return pages
+        Processes suit the in-process backends (PyMuPDF, pypdf), whose parsing
+        holds the GIL, at the cost of pickling every page back. Threads skip the
+        pickling and are the better choice for pdftotext, which runs in a
+        subprocess; pypdfium2 calls are serialised either way within a process.
+        
+        Args:
+            pdf_paths: PDF file paths
+            workers: number of workers (default: CPU count)
+            use_threads: use a thread pool instead of a process pool
+            
+        Returns:
+            Dict[str, List[PDFPage]]: pages per path, [] for a failed file
+        """
+        paths = list(dict.fromkeys(pdf_paths))
+        if not paths:
+            return {}
+        
+        workers = min(workers or os.cpu_count() or 1, len(paths))
+        results = {}
+        
+        if use_threads:
+            executor = ThreadPoolExecutor(max_workers=workers)
+            futures = {path: executor.submit(self.extract_text, path) for path in paths}
+        else:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            futures = {
+                path: executor.submit(
+                    _extract_pages_worker,
+                    path,
+                    self.backend,
+                    str(self.cache_dir) if self.cache_dir else None,
+                    self.with_metadata,
+                )
+                for path in paths
+            }
+        
+        with executor:
+            for path, future in futures.items():
+                try:
+                    results[path] = future.result()
+                except Exception as e:
+                    print(f"PDF extraction failed for {path}: {e}")
+                    results[path] = []
+        
+        return results
+    
+    def extract_document(self, pdf_path: str) -> PDFDocument:
+        """
+        Extracts a PDF into column form, for bulk operations over its pages
+        
+        Args:
+            pdf_path: PDF file path
+            
+        Returns:
+            PDFDocument: page numbers, texts, rotations and media boxes
+        """
+        return PDFDocument.from_pages(self.iter_pages(pdf_path))
+    
+    def extract_text_and_full(self, pdf_path: PDFInput) -> Tuple[List[PDFPage], str]:
+        """
+        Extracts the pages and the concatenated full text in one parse
+        
+        Args:
+            pdf_path: PDF file path, or its content as bytes / mmap
+            
+        Returns:
+            Tuple[List[PDFPage], str]: PDF pages and their text joined by newlines
+        """
+        pages = self.extract_text(pdf_path)
+        return pages, "\n".join(page.text or "" for page in pages)
+    
+    def _extract_text_pdftotext(self, pdf_path: PDFInput) -> List[PDFPage]:
+        """Extracts text with the pdftotext binary; pages are separated by form feeds"""
+        # an in-memory PDF is piped to stdin
+        data = pdf_path if _is_buffer(pdf_path) else None
+        try:
+            proc = subprocess.run(
+                [self._pdftotext, "-enc", "UTF-8", "-" if data is not None else pdf_path, "-"],
+                input=data,
+                capture_output=True,
+                timeout=120,
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"pdftotext failed: {e}")
+            return []
+        
+        if proc.returncode != 0:
+            return []
+        
+        texts = proc.stdout.decode("utf-8", errors="replace").split("\f")
+        # pdftotext terminates every page with a form feed
+        if texts and not texts[-1].strip():
+            texts.pop()
+        
+        return [
+            PDFPage(page_number=page_num, text=text, metadata={} if self.with_metadata else None)
+            for page_num, text in enumerate(texts, 1)
+        ]
+    
+    def _iter_pages_pymupdf(self, pymupdf, pdf_path: PDFInput) -> Iterator[PDFPage]:
+        """Yields pages extracted with PyMuPDF (MuPDF C library)"""
+        try:
+            doc = _pymupdf_open(pymupdf, pdf_path)
+            n_pages = len(doc)
+            if n_pages <= PARALLEL_PAGE_THRESHOLD or self.page_workers < 2:
+                try:
+                    for page_num, page in enumerate(doc, 1):
+                        yield PDFPage(
+                            page_number=page_num,
+                            text=page.get_text("text"),
+                            metadata={
+                                "rotation": page.rotation,
+                                "media_box": tuple(page.rect),
+                            } if self.with_metadata else None,
+                        )
+                finally:
+                    doc.close()
+                return
+            doc.close()
+            
+            # MuPDF documents are not thread-safe and get_text holds the GIL,
+            # so page ranges go to worker processes that each open the file
+            step = -(-n_pages // self.page_workers)
+            starts = range(0, n_pages, step)
+            if _is_buffer(pdf_path) and not isinstance(pdf_path, bytes):
+                # a mmap / view cannot be pickled to the workers
+                pdf_path = bytes(pdf_path)
+            parts = self._get_page_pool().map(
+                _pymupdf_page_range,
+                [pdf_path] * len(starts),
+                starts,
+                [lo + step for lo in starts],
+                [self.with_metadata] * len(starts),
+            )
+            for part in parts:
+                yield from part
+        
+        except Exception as e:
+            print(f"PDF extraction failed: {e}")
+    
+    def _iter_pages_pdfium(self, pdfium, pdf_path: PDFInput) -> Iterator[PDFPage]:
+        """Yields pages extracted with pypdfium2 (PDFium C++ engine)"""
+        pages = []
+        try:
+            # extract everything under the lock, never hold it across a yield
+            with _pdfium_input(pdf_path) as pdf_input, _PDFIUM_LOCK:
+                pdf = pdfium.PdfDocument(pdf_input)
+                try:
+                    for i in range(len(pdf)):
+                        text, metadata = _pdfium_page_text(pdf, i, self.with_metadata)
+                        pages.append(PDFPage(page_number=i + 1, text=text, metadata=metadata))
+                finally:
+                    pdf.close()
+        
+        except Exception as e:
+            print(f"PDF extraction failed: {e}")
+        
+        yield from pages
+    
+    def _get_page_pool(self) -> ProcessPoolExecutor:
+        """Returns the parser's page extraction process pool"""
+        with self._page_pool_lock:
+            if self._page_pool is None:
+                self._page_pool = ProcessPoolExecutor(max_workers=self.page_workers)
+            return self._page_pool
+    
+    def close(self):
+        """Shuts down the page extraction process pool"""
+        with self._page_pool_lock:
+            if self._page_pool is not None:
+                self._page_pool.shutdown()
+                self._page_pool = None
     
     def _basic_text_extraction(self, pdf_path: str) -> List[PDFPage]:
-        """Basic text extraction (when PyPDF2 is not available)"""
-        # This is a fallback, should ideally use pdfplumber or PyPDF2
+        """Basic text extraction (when no PDF library is available)"""
+        # This is a fallback, should ideally use PyMuPDF or pypdf
         return []
     
-    def parse_structure(self, pages: List[PDFPage]) -> List[PDFSection]:
+    def parse_structure(self, pages: Iterable[PDFPage]) -> List[PDFSection]:
         """
         Parses PDF structure (identifies chapters)
         
         Args:
-            pages: List of PDF pages
+            pages: PDF pages (a list, or the iter_pages generator)
             
         Returns:
             List[PDFSection]: List of PDF sections
         """
+        return self.parse_and_citations(pages)[0]
+    
+    def parse_and_citations(self, pages: Iterable[PDFPage]) -> Tuple[List[PDFSection], List[str]]:
+        """
+        Parses the sections and extracts the citations in one pass over the lines
+        
+        Citations follow the first references heading and end at an appendix
+        heading, the same section extract_citations uses.
+        
+        Args:
+            pages: PDF pages (a list, or the iter_pages generator)
+            
+        Returns:
+            Tuple[List[PDFSection], List[str]]: sections and citations
+        """
         sections = []
         current_section = None
+        # lines of the open section, joined once when it closes
+        chunks: List[str] = []
+        # lines of the references section, classified at the end
+        ref_lines: List[str] = []
+        # "body" until the first references heading, "refs" until an appendix
+        ref_state = "body"
         
         for page in pages:
-            lines = page.text.split('\n')
+            text = page.text or ""
+            # most pages have no references heading, skip the per-line check there
+            has_heading = _REFERENCES_HEADING_LINE_RE.search(text) is not None
             
-            for line in lines:
+            for line in text.split('\n'):
                 line = line.strip()
                 
+                if ref_state == "body":
+                    if has_heading and _is_references_heading(line):
+                        ref_state = "refs"
+                elif ref_state == "refs" and line:
+                    if _is_appendix_heading(line):
+                        ref_state = "appendix"
+                    elif not (has_heading and _is_references_heading(line)):
+                        ref_lines.append(line)
+                
                 # Identify section titles (uppercase, bold, etc.)
                 if self._is_section_title(line):
                     if current_section:
+                        current_section.content = "".join(chunks)
+                        current_section.content_preview = current_section.content[:SECTION_PREVIEW_CHARS]
                         sections.append(current_section)
                     
                     current_section = PDFSection(
@@ -128,14 +953,17 @@ class PDFParser:
                         end_page=page.page_number,
                         content="",
                     )
+                    chunks = []
                 elif current_section and line:
-                    current_section.content += line + "\n"
+                    chunks.append(line + "\n")
                     current_section.end_page = page.page_number
         
         if current_section:
+            current_section.content = "".join(chunks)
+            current_section.content_preview = current_section.content[:SECTION_PREVIEW_CHARS]
             sections.append(current_section)
         
-        return sections
+        return sections, _CITATION_LINE_RE.findall("\n".join(ref_lines))
     
     @staticmethod
     def _is_section_title(text: str) -> bool:
@@ -148,19 +976,13 @@ class PDFParser:
             return True
         
         # Check for common section titles
-        common_titles = [
-            "abstract", "introduction", "methodology", "method",
-            "results", "discussion", "conclusion", "references",
-            "acknowledgments", "appendix", "related work"
-        ]
-        
-        text_lower = text.lower()
-        return any(title in text_lower for title in common_titles)
+        return _SECTION_RE.search(text) is not None
     
     def extract_key_information(
         self,
         pdf_path: str,
         sections: Optional[List[PDFSection]] = None,
+        include: Optional[Iterable[str]] = None,
     ) -> ExtractedInfo:
         """
         Extracts key information from the paper
@@ -168,68 +990,188 @@ class PDFParser:
         Args:
             pdf_path: PDF file path
             sections: List of PDF sections (optional)
+            include: EXTRACTION_FIELDS keys to ask the LLM for (default: all);
+                fewer keys mean a shorter response
             
         Returns:
             ExtractedInfo: Extracted information
         """
         if sections is None:
-            pages = self.extract_text(pdf_path)
-            sections = self.parse_structure(pages)
+            sections = self.parse_structure(self.iter_pages(pdf_path))
         
-        # If an LLM client is available, use it for intelligent parsing
-        if self.llm_client and sections:
-            return self._extract_with_llm(sections)
-        else:
-            return self._extract_local(sections)
+        # Well-structured papers cover the long fields through their section
+        # titles; the full LLM extraction only runs when that lookup comes up
+        # short, otherwise a targeted call fills the remaining fields
+        info = self._extract_local(sections)
+        if not self.llm_client or not sections:
+            return info
+        if not self._is_complete(info):
+            return self._extract_with_llm(sections, include)
+        
+        gaps = self._gap_fields(include)
+        if gaps:
+            try:
+                response = self.llm_client.call(
+                    self._build_extraction_prompt(sections, gaps), **_EXTRACTION_LLM_KWARGS
+                )
+                self._merge_gaps(info, self._parse_extraction_response(response))
+            except Exception as e:
+                print(f"LLM extraction failed: {e}")
+        return info
+    
+    async def extract_key_information_async(
+        self,
+        pdf_path: str,
+        sections: Optional[List[PDFSection]] = None,
+        include: Optional[Iterable[str]] = None,
+    ) -> ExtractedInfo:
+        """
+        Async variant of extract_key_information
+        
+        Parsing runs in a worker thread and the LLM request goes through the
+        client's acall() when it has one, so gathering this over several papers
+        parses one paper while another waits for its LLM response.
+        
+        Args:
+            pdf_path: PDF file path
+            sections: List of PDF sections (optional)
+            include: EXTRACTION_FIELDS keys to ask the LLM for (default: all)
+            
+        Returns:
+            ExtractedInfo: Extracted information
+        """
+        if sections is None:
+            sections = await asyncio.to_thread(
+                lambda: self.parse_structure(self.iter_pages(pdf_path))
+            )
+        
+        info = self._extract_local(sections)
+        if not self.llm_client or not sections:
+            return info
+        
+        complete = self._is_complete(info)
+        keys = self._gap_fields(include) if complete else include
+        if complete and not keys:
+            return info
+        
+        prompt = self._build_extraction_prompt(sections, keys)
+        try:
+            if hasattr(self.llm_client, "acall"):
+                response = await self.llm_client.acall(prompt, **_EXTRACTION_LLM_KWARGS)
+            else:
+                response = await asyncio.to_thread(self.llm_client.call, prompt, **_EXTRACTION_LLM_KWARGS)
+            extracted = self._parse_extraction_response(response)
+            return self._merge_gaps(info, extracted) if complete else extracted
+        except Exception as e:
+            print(f"LLM extraction failed: {e}")
+            return info
     
-    def _extract_with_llm(self, sections: List[PDFSection]) -> ExtractedInfo:
+    def _extract_with_llm(
+        self,
+        sections: List[PDFSection],
+        include: Optional[Iterable[str]] = None,
+    ) -> ExtractedInfo:
         """Smart extraction using LLM"""
-        # Prepare prompt
-        content_text = "\n\n".join([
-            f"## {s.title}\n{s.content[:100]}"
-            for s in sections  # Use only the first 5 sections
-        ])
-   
-        prompt = f"""Extract key information from the following paper content, return in JSON format:
+        prompt = self._build_extraction_prompt(sections, include)
+        
+        try:
+            response = self.llm_client.call(prompt, **_EXTRACTION_LLM_KWARGS)
+            info = self._parse_extraction_response(response)
+            return info
+        except Exception as e:
+            print(f"LLM extraction failed: {e}")
+            return self._extract_local(sections)
+    
+    @staticmethod
+    def _build_extraction_prompt(
+        sections: List[PDFSection],
+        include: Optional[Iterable[str]] = None,
+    ) -> str:
+        """Builds the key information extraction prompt for one paper"""
+        if include is None:
+            keys = list(EXTRACTION_FIELDS)
+        else:
+            keys = ["objective" if key == "objectives" else key for key in include]
+            unknown = [key for key in keys if key not in EXTRACTION_FIELDS]
+            if unknown:
+                raise ValueError(f"Unknown extraction fields: {unknown}")
+        
+        content_text = "\n\n".join(
+            f"## {s.title}\n{s.content[:PROMPT_SECTION_CHARS]}"
+            for s in sections[:PROMPT_SECTIONS]
+        )
+        template = json.dumps({key: EXTRACTION_FIELDS[key] for key in keys}, indent=1)
+        
+        return f"""Extract key information from the following paper content.
 
 {content_text}
 
-Please provide:
-1. title: Paper title
-2. authors: List of authors, split by ;
-3. abstract: Abstract
-4. objective: Research objective
-5. methodology: Research methodology, including step
-6. datasets: datasets decription, if there is
-7. models: models been used, if there is
-8. evaluation: evaluation approach and metrics, if thre is
-9. results: Main results and conclusion
-10. contributions: Key contributions and innovation
-11. limitations: Limitations of the paper
-
-### Output Requirements (must be strictly followed)
-<response>
-  <title> Paper title  </title> 
-  <authors>List of authors</authors>
-  <abstract>Abstract </abstract>
-  <objective>Research_objective </objective>
-  <methodology> Research methodology </methodology>
-  <datasets> Datasets </datasets>
-  <models> Models </models>
-  <evaluation> Evaluation </evaluation>
-  <results>Main results</results>
-  <contributions>  Key contributions </contributions>
-  <limitations> Limitations </limitations>
-</response>
+Return only a JSON object with these keys ("" when unknown):
+{template}
 """
+    
+    def extract_key_information_batch(
+        self,
+        pdf_paths: List[str],
+        concurrency: int = 8,
+        include: Optional[Iterable[str]] = None,
+    ) -> List[ExtractedInfo]:
+        """
+        Extracts key information from many papers, overlapping the LLM calls
         
+        As in extract_key_information, papers the local section lookup already
+        covers only ask the LLM for the fields it cannot fill; all requests are
+        sent with the client's call_batch (at most `concurrency` requests in
+        flight) when it has one.
+        
+        Args:
+            pdf_paths: PDF file paths
+            concurrency: max LLM requests in flight
+            include: EXTRACTION_FIELDS keys to ask the LLM for (default: all)
+            
+        Returns:
+            List[ExtractedInfo]: one result per path, in order
+        """
+        all_sections = [self.parse_structure(self.iter_pages(path)) for path in pdf_paths]
+        infos = [self._extract_local(sections) for sections in all_sections]
+        if not self.llm_client:
+            return infos
+        
+        gaps = self._gap_fields(include)
+        # (index, locally complete) of every paper that needs a request
+        pending = []
+        for i, sections in enumerate(all_sections):
+            if not sections:
+                continue
+            complete = self._is_complete(infos[i])
+            if not complete or gaps:
+                pending.append((i, complete))
+        if not pending:
+            return infos
+        
+        prompts = [
+            self._build_extraction_prompt(all_sections[i], gaps if complete else include)
+            for i, complete in pending
+        ]
         try:
-            response = self.llm_client.call(prompt, max_tokens=10240 , temperature=0.3 ,output_format="json")
-            info = self._parse_extraction_response(response)
-            return info
+            if hasattr(self.llm_client, "call_batch"):
+                responses = self.llm_client.call_batch(
+                    prompts, concurrency=concurrency, **_EXTRACTION_LLM_KWARGS
+                )
+            else:
+                responses = [self.llm_client.call(prompt, **_EXTRACTION_LLM_KWARGS) for prompt in prompts]
         except Exception as e:
             print(f"LLM extraction failed: {e}")
-            return self._extract_local(sections)
+            return infos
+        
+        for (i, complete), response in zip(pending, responses):
+            try:
+                extracted = self._parse_extraction_response(response)
+                infos[i] = self._merge_gaps(infos[i], extracted) if complete else extracted
+            except Exception as e:
+                print(f"LLM extraction failed for {pdf_paths[i]}: {e}")
+        
+        return infos
     
     def _extract_local(self, sections: List[PDFSection]) -> ExtractedInfo:
         """Local extraction (without LLM)"""
@@ -247,6 +1189,32 @@ Please provide:
             limitations="",
             figures=[],
             tables=[],
+            conclusion=self._find_section(sections, "conclusion", ""),
+        )
+    
+    @staticmethod
+    def _gap_fields(include: Optional[Iterable[str]] = None) -> List[str]:
+        """LOCAL_GAP_FIELDS the caller asked for (all of them by default)"""
+        if include is None:
+            return list(LOCAL_GAP_FIELDS)
+        wanted = {"objective" if key == "objectives" else key for key in include}
+        return [key for key in LOCAL_GAP_FIELDS if key in wanted]
+    
+    @staticmethod
+    def _merge_gaps(info: ExtractedInfo, extracted: ExtractedInfo) -> ExtractedInfo:
+        """Copies the gap fields the LLM filled onto a local extraction"""
+        for name in ("authors", "objectives", "datasets", "models", "evaluation", "limitations"):
+            value = getattr(extracted, name)
+            if value:
+                setattr(info, name, value)
+        return info
+    
+    @staticmethod
+    def _is_complete(info: ExtractedInfo) -> bool:
+        """Whether local extraction found enough text for every required field"""
+        return all(
+            len(getattr(info, name) or "") >= LOCAL_MIN_CHARS
+            for name in LOCAL_REQUIRED_FIELDS
         )
     
     @staticmethod
@@ -258,137 +1226,75 @@ Please provide:
         """Finds a specific section"""
         for section in sections:
             if keyword.lower() in section.title.lower():
-                return section.content[:1000]  # Return first 1000 characters
+                # Return first 1000 characters
+                return section.content_preview or section.content[:SECTION_PREVIEW_CHARS]
         return default
     
     @staticmethod
     def _parse_extraction_response(response: str) -> ExtractedInfo:
-        """Parses LLM response"""
-        title = None
-        try:
-            start_tag = "<title>"
-            end_tag = "</title>"
-            start_idx = response.index(start_tag) + len(start_tag)
-            end_idx = response.index(end_tag)
-            title = response[start_idx:end_idx].strip()
-        except ValueError:
-            pass
-
-        authors = []
-        try:
-            start_tag = "<authors>"
-            end_tag = "</authors>"
-            start_idx = response.index(start_tag) + len(start_tag)
-            end_idx = response.index(end_tag)
-            concepts_text = response[start_idx:end_idx].strip()
-            authors = [c.strip() for c in concepts_text.split(";") if c.strip()]
-        except ValueError:
-            pass
-        abstract = None
-        try:
-            start_tag = "<abstract>"
-            end_tag = "</abstract>"
-            start_idx = response.index(start_tag) + len(start_tag)
-            end_idx = response.index(end_tag)
-            abstract = response[start_idx:end_idx].strip()
-        except ValueError:
-            pass
+        """Parses LLM response (a JSON object, or the older <tag> format)"""
+        fields = PDFParser._load_json_fields(response)
+        if fields is None:
+            # one scan over the response for all tags; first occurrence wins
+            fields = {}
+            for match in _EXTRACTION_TAG_RE.finditer(response):
+                fields.setdefault(match.group(1).lower(), match.group(2).strip())
         
-        objective = None
-        try:
-            start_tag = "<objective>"
-            end_tag = "</objective>"
-            start_idx = response.index(start_tag) + len(start_tag)
-            end_idx = response.index(end_tag)
-            objective = response[start_idx:end_idx].strip()
-        except ValueError:
-            pass
-
-        methodology = None
-        try:
-            start_tag = "<methodology>"
-            end_tag = "</methodology>"
-            start_idx = response.index(start_tag) + len(start_tag)
-            end_idx = response.index(end_tag)
-            methodology = response[start_idx:end_idx].strip()
-        except ValueError:
-            pass
-        
-        datasets = None
-        try:
-            start_tag = "<datasets>"
-            end_tag = "</datasets>"
-            start_idx = response.index(start_tag) + len(start_tag)
-            end_idx = response.index(end_tag)
-            datasets = response[start_idx:end_idx].strip()
-        except ValueError:
-            pass
-
-        models = None
-        try:
-            start_tag = "<models>"
-            end_tag = "</models>"
-            start_idx = response.index(start_tag) + len(start_tag)
-            end_idx = response.index(end_tag)
-            models = response[start_idx:end_idx].strip()
-        except ValueError:
-            pass
-        
-        evaluation = None
-        try:
-            start_tag = "<evaluation>"
-            end_tag = "</evaluation>"
-            start_idx = response.index(start_tag) + len(start_tag)
-            end_idx = response.index(end_tag)
-            evaluation = response[start_idx:end_idx].strip()
-        except ValueError:
-            pass
-
-        results = None
-        try:
-            start_tag = "<results>"
-            end_tag = "</results>"
-            start_idx = response.index(start_tag) + len(start_tag)
-            end_idx = response.index(end_tag)
-            results = response[start_idx:end_idx].strip()
-        except ValueError:
-            pass
-        
-        contributions = None
-        try:
-            start_tag = "<contributions>"
-            end_tag = "</contributions>"
-            start_idx = response.index(start_tag) + len(start_tag)
-            end_idx = response.index(end_tag)
-            contributions = response[start_idx:end_idx].strip()
-        except ValueError:
-            pass
-        
-        limitations = None
-        try:
-            start_tag = "<limitations>"
-            end_tag = "</limitations>"
-            start_idx = response.index(start_tag) + len(start_tag)
-            end_idx = response.index(end_tag)
-            limitations = response[start_idx:end_idx].strip()
-        except ValueError:
-            pass            
+        authors_value = fields.get("authors")
+        if isinstance(authors_value, list):
+            authors = [str(a).strip() for a in authors_value if str(a).strip()]
+        elif authors_value:
+            authors = [c.strip() for c in str(authors_value).split(";") if c.strip()]
+        else:
+            authors = []
         
         return ExtractedInfo(
-            title=title,
+            title=fields.get("title"),
             authors=authors,
-            abstract=abstract,
-            objectives=objective,
-            methodology=methodology,
-            datasets=datasets,
-            models=models,
-            evaluation=evaluation,
-            results=results,
-            contributions=contributions,
-            limitations=limitations,
+            abstract=fields.get("abstract"),
+            objectives=fields.get("objective", fields.get("objectives")),
+            methodology=fields.get("methodology"),
+            datasets=fields.get("datasets"),
+            models=fields.get("models"),
+            evaluation=fields.get("evaluation"),
+            results=fields.get("results"),
+            contributions=fields.get("contributions"),
+            limitations=fields.get("limitations"),
             figures=None,
             tables=None,
+            conclusion=fields.get("conclusion", ""),
         )
+    
+    @staticmethod
+    def _load_json_fields(response: str) -> Optional[Dict]:
+        """
+        Reads the extraction response as a JSON object
+        
+        Args:
+            response: raw LLM response, possibly wrapped in a ```json fence
+            
+        Returns:
+            Optional[Dict]: lower-cased keys with stripped string values, or None
+            when the response is not a JSON object
+        """
+        start = response.find("{")
+        end = response.rfind("}")
+        if start < 0 or end <= start:
+            return None
+        try:
+            # orjson when installed; its decode error is a ValueError too
+            data = json_loads(response[start:end + 1])
+        except ValueError:
+            return None
+        if not isinstance(data, dict):
+            return None
+        
+        fields = {}
+        for key, value in data.items():
+            if isinstance(value, str):
+                value = value.strip()
+            fields[str(key).lower()] = value
+        return fields
         
     
     def extract_citations(self, pages: List[PDFPage]) -> List[str]:
@@ -403,42 +1309,45 @@ Please provide:
         """
         citations = []
         
-        # Merge all text
-        all_text = "\n".join([page.text for page in pages])
+        # References follow the body: the first page with the heading opens
+        # them, one search per page instead of merging the whole document;
+        # headings inside a later appendix are ignored (callers that also need
+        # the sections should use parse_and_citations)
+        start = heading = None
+        for idx, page in enumerate(pages):
+            heading = _REFERENCES_HEADING_LINE_RE.search(page.text or "")
+            if heading:
+                start = idx
+                break
         
-        # Find references section
-        lines = all_text.split('\n')
-        in_references = False
+        if start is None:
+            return citations
         
-        for line in lines:
-            line = line.strip()
-            
-            # Check if entering the references section
-            if line.lower().startswith('references') or line.lower().startswith('bibliography'):
-                in_references = True
+        # the section starts on the line after the first heading of that page
+        text = pages[start].text or ""
+        eol = text.find('\n', heading.end())
+        texts = [text[eol + 1:] if eol >= 0 else ""]
+        texts.extend(page.text or "" for page in pages[start + 1:])
+        
+        # gather the section's lines up to an appendix, then classify them all
+        # in one regex pass
+        ref_lines = []
+        for text in texts:
+            for line in text.split('\n'):
+                line = line.strip()
+                if _is_appendix_heading(line):
+                    break
+                if line and not _is_references_heading(line):
+                    ref_lines.append(line)
+            else:
                 continue
-            
-            # Inside the references section
-            if in_references and line:
-                # Check if it looks like a citation (starts with number or author name)
-                if self._looks_like_citation(line):
-                    citations.append(line)
+            break
         
+        citations.extend(_CITATION_LINE_RE.findall("\n".join(ref_lines)))
         return citations
     
     @staticmethod
     def _looks_like_citation(line: str) -> bool:
         """Checks if a line looks like a citation"""
-        # Simple heuristic
-        if not line:
-            return False
-        
-        # Check if it starts with a number, bracket, or author name
-        if line[0].isdigit():
-            return True
-        if line[0] in '([':
-            return True
-        if ',' in line and len(line) > 20:  # Has a comma and is long enough
-            return True
-        
-        return False
+        # starts with a number or bracket, or has a comma and is long enough
+        return bool(line) and _CITATION_LINE_RE.fullmatch(line) is not None
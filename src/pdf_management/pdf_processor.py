@@ -2,19 +2,43 @@
 PDF processor - including download, cache, parse
 """
 from typing import Dict, Optional, List
+from collections import OrderedDict, defaultdict
+from dataclasses import asdict, fields, is_dataclass
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from .downloader import PDFDownloader
 from .parser import PDFParser, ExtractedInfo
 from .cache_manager import CacheManager
-import hashlib
+import os
+import logging
+import zlib
+import threading
+
+logger = logging.getLogger(__name__)
+
+# url -> paper id entries remembered per processor
+PAPER_ID_CACHE_SIZE = 10000
+
+_EXTRACTED_FIELDS = tuple(f.name for f in fields(ExtractedInfo))
 
 class PDFProcessor:
     """PDF procesor """
     
+    __slots__ = (
+        "downloader",
+        "parser",
+        "cache_manager",
+        "llm_client",
+        "_url_to_paper_id",
+        "_paper_id_lock",
+    )
+    
     def __init__(
         self,
         cache_dir: str = "./cache/pdfs",
         llm_client=None,
         max_workers: int = 4,
+        pdf_backend: str = "auto",
+        pages_cache_dir: Optional[str] = None,
     ):
         """
         initialize PDF prcessor
@@ -23,17 +47,27 @@ class PDFProcessor:
             cache_dir: cache dir
             llm_client: LLM clicent
             max_workers: number of workers that download pdf
+            pdf_backend: text extraction backend passed to PDFParser
+            pages_cache_dir: PDFParser cache of extracted pages (None disables it)
         """
         self.downloader = PDFDownloader(download_dir=cache_dir, max_workers=max_workers)
-        self.parser = PDFParser(llm_client=llm_client)
+        self.parser = PDFParser(
+            llm_client=llm_client,
+            backend=pdf_backend,
+            cache_dir=pages_cache_dir,
+        )
         self.cache_manager = CacheManager(cache_dir=cache_dir)
         self.llm_client = llm_client
+        # repeated urls (batches, re-runs) skip the hash
+        self._url_to_paper_id: "OrderedDict[str, str]" = OrderedDict()
+        self._paper_id_lock = threading.Lock()
     
     def process_paper(
         self,
         paper: Dict,
         urlkey: str = "pdf_url",
         force_reprocess: bool = False,
+        return_bytes: bool = False,
     ) -> Dict:
         """
         process single paper: download -> parse -> extraction
@@ -47,6 +81,8 @@ class PDFProcessor:
                     ...
                 }
             force_reprocess: if repprocess in force
+            return_bytes: keep the freshly downloaded PDF body as "pdf_bytes"
+                (None when the PDF came from cache)
             
         Returns:
             Dict: process result
@@ -55,12 +91,12 @@ class PDFProcessor:
                     "paper_id": str,
                     "pdf_path": str,
                     "extracted_info": ExtractedInfo,
+                    "full_text": str (only when the PDF was parsed in this call),
                     "error": str,
                 }
         """
         url = paper.get(urlkey, "")
-        url_hash = hashlib.md5(url.encode()).hexdigest()[:8]
-        paper_id = url_hash
+        paper_id = self.get_paper_id(url)
         
         if not paper_id or not url:
             return {
@@ -72,6 +108,8 @@ class PDFProcessor:
                 "error": "missing paper_id or url",
             }
         
+        # register + status updates of this paper become one metadata record
+        self.cache_manager.begin_batch()
         try:
             # 1. check cache
             if not force_reprocess and self.cache_manager.has_cached_pdf(paper_id):
@@ -84,8 +122,8 @@ class PDFProcessor:
                     extracted_info = ExtractedInfo(**extracted_info)
                     extracted_info.url = url
                     extracted_info.title = paper.get("title", extracted_info.title)
-                    print(extracted_info.title )
-                    print(extracted_info.contributions)
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("cached paper %s: %s", extracted_info.title, extracted_info.contributions)
                     return {
                         "success": True,
                         "paper_id": paper_id,
@@ -96,8 +134,14 @@ class PDFProcessor:
                     }
             
             # 2. download PDF
-            print(f"📥 download paper: {paper_id} url: {url}")
-            download_result = self.downloader.download_paper(url)
+            logger.info("📥 download paper: %s url: %s", paper_id, url)
+            cached = self.cache_manager.get_metadata(paper_id)
+            download_result = self.downloader.download_paper(
+                url,
+                output_path=str(self.cache_manager.get_cache_path(paper_id)),
+                etag=cached.metadata.get("etag") if cached else None,
+                return_bytes=return_bytes,
+            )
             
             if not download_result["success"]:
                 return {
@@ -118,11 +162,20 @@ class PDFProcessor:
                 file_path=pdf_path,
                 file_size=download_result["file_size"],
             )
-            self.cache_manager.update_metadata(paper_id, status="processing")
+            self.cache_manager.update_metadata(
+                paper_id,
+                status="processing",
+                metadata={"etag": download_result.get("etag")},
+            )
             
             # 4. parse PDF
-            print(f"📖 parse PDF: {paper_id}, url: {url}")
-            pages = self.parser.extract_text(pdf_path)
+            logger.info("📖 parse PDF: %s, url: %s", paper_id, url)
+            # parse the body just downloaded from memory; otherwise let the
+            # backend open the file itself (and split large files across workers)
+            content = download_result.get("content")
+            pages, full_text = self.parser.extract_text_and_full(
+                content if content is not None else pdf_path
+            )
             
             if not pages:
                 return {
@@ -135,24 +188,22 @@ class PDFProcessor:
                 }
             
             # 5. extract info
-            print(f"🔍 extract info: {paper_id}")
-            sections = self.parser.parse_structure(pages)
+            logger.info("🔍 extract info: %s", paper_id)
+            # sections and citations come from one pass over the page lines
+            sections, citations = self.parser.parse_and_citations(pages)
             extracted_info = self.parser.extract_key_information(pdf_path, sections)
             extracted_info.url = url
             extracted_info.title = paper.get("title", extracted_info.title)
-            print(extracted_info.title )
-            print(extracted_info.contributions)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("extracted paper %s: %s", extracted_info.title, extracted_info.contributions)
             
-            # 6. extract citations
-            citations = self.parser.extract_citations(pages)
-            
-            # 7. update metatda cache
+            # 6. update metatda cache
             from datetime import datetime
             self.cache_manager.update_metadata(
                 paper_id,
                 status="extracted",
                 metadata={
-                    "extracted_info": self._convert_to_dict(extracted_info),
+                    "extracted_info": self._extracted_info_to_dict(extracted_info),
                     "citations": citations,
                     "page_count": len(pages),
                     "extracted_sections": len(sections),
@@ -167,6 +218,8 @@ class PDFProcessor:
                 "pdf_path": pdf_path,
                 "extracted_info": extracted_info,
                 "citations": citations,
+                "full_text": full_text,
+                "pdf_bytes": download_result.get("content"),
                 "error": None,
             }
         
@@ -179,6 +232,8 @@ class PDFProcessor:
                 "extracted_info": None,
                 "error": f"process failed: {str(e)}",
             }
+        finally:
+            self.cache_manager.commit_batch()
     
     def process_papers_batch(
         self,
@@ -203,33 +258,110 @@ class PDFProcessor:
             "papers": {},
         }
         
-        for i, paper in enumerate(papers, 1):
-            print(f"\n[{i}/{len(papers)}] processing paper...")
-            result = self.process_paper(paper, urlkey, force_reprocess)
-            
-            paper_id = result["paper_id"]
-            results["papers"][paper_id] = result
-            
-            if result["success"]:
-                results["successful"] += 1
-            else:
-                results["failed"] += 1
+        # fetch every missing PDF on one event loop, then parse
+        self.prefetch_pdfs(papers, urlkey)
+        
+        # papers are independent (download + parse), so run them concurrently;
+        # the same PDF url is processed once, it would write the same cache file
+        unique = {}
+        copies = defaultdict(int)
+        for paper in papers:
+            paper_id = self.get_paper_id(paper.get(urlkey, ""))
+            unique.setdefault(paper_id, paper)
+            copies[paper_id] += 1
         
+        # the whole batch's metadata goes out in one write
+        self.cache_manager.begin_batch()
+        try:
+            with ThreadPoolExecutor(max_workers=self.downloader.max_workers) as executor:
+                futures = [
+                    executor.submit(self.process_paper, paper, urlkey, force_reprocess)
+                    for paper in unique.values()
+                ]
+                for i, future in enumerate(as_completed(futures), 1):
+                    result = future.result()
+                    logger.info("[%d/%d] processed paper %s", i, len(futures), result["paper_id"])
+                    
+                    results["papers"][result["paper_id"]] = result
+                    # duplicates share the outcome, so the counts still add up to total
+                    if result["success"]:
+                        results["successful"] += copies[result["paper_id"]]
+                    else:
+                        results["failed"] += copies[result["paper_id"]]
+        finally:
+            self.cache_manager.commit_batch()
+        
+        self.cache_manager.flush()
         return results
     
+    def prefetch_pdfs(self, papers: List[Dict], urlkey: str = "pdf_url"):
+        """
+        Downloads PDFs not yet in the cache concurrently, straight to their cache paths
+        
+        Uses the downloader's single-event-loop batch (aiohttp, or its thread
+        pool fallback); process_paper then finds the files in place. Failures
+        are left for process_paper to retry and report.
+        
+        Args:
+            papers: paper list
+            urlkey: key of the PDF url in each paper
+        """
+        jobs = {}
+        for paper in papers:
+            url = paper.get(urlkey)
+            if not url:
+                continue
+            paper_id = self.get_paper_id(url)
+            output_path = str(self.cache_manager.get_cache_path(paper_id))
+            if paper_id not in jobs and not os.path.exists(output_path):
+                jobs[paper_id] = {"paper_id": paper_id, "url": url, "output_path": output_path}
+        
+        if jobs:
+            try:
+                self.downloader.download_papers_batch_async(list(jobs.values()))
+            except Exception as e:
+                logger.warning("PDF prefetch failed: %s", e)
+    
+    def get_paper_id(self, url: str) -> str:
+        """make_paper_id, memoized in a bounded LRU"""
+        with self._paper_id_lock:
+            paper_id = self._url_to_paper_id.get(url)
+            if paper_id is not None:
+                self._url_to_paper_id.move_to_end(url)
+                return paper_id
+        
+        paper_id = self.make_paper_id(url)
+        with self._paper_id_lock:
+            self._url_to_paper_id[url] = paper_id
+            while len(self._url_to_paper_id) > PAPER_ID_CACHE_SIZE:
+                self._url_to_paper_id.popitem(last=False)
+        return paper_id
+    
+    @staticmethod
+    def make_paper_id(url: str) -> str:
+        """cache id of a paper, derived from its PDF url"""
+        # only a short cache key, no need for a cryptographic hash
+        return f"{zlib.crc32(url.encode()):08x}"
+    
+    @staticmethod
+    def _extracted_info_to_dict(info: ExtractedInfo) -> Dict:
+        """ExtractedInfo as a plain dict; lists are copied so the record does not alias the live object"""
+        record = {name: getattr(info, name) for name in _EXTRACTED_FIELDS}
+        for name, value in record.items():
+            if type(value) is list:
+                record[name] = list(value)
+        return record
+    
     @staticmethod
     def _convert_to_dict(obj):
         """convert to dict (used for JSON serialize"""
+        # dataclass instances (not classes), nested dataclasses included
+        if is_dataclass(obj) and not isinstance(obj, type):
+            return asdict(obj)
+        
         if isinstance(obj, dict):
             return obj
         
-        # if it is dataclass
-        if hasattr(obj, '__dataclass_fields__'):
-            return {
-                field: getattr(obj, field)
-                for field in obj.__dataclass_fields__
-            }
-        
         return str(obj)
     
     def get_cache_stats(self) -> Dict:
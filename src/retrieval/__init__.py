@@ -5,9 +5,11 @@
 from .semantic_search import SemanticSearcher
 from .paper_sources import PaperSourceManager
 from .retriever import Retriever
+from .query_cache import SemanticQueryCache
 
 __all__ = [
     "SemanticSearcher",
     "PaperSourceManager",
     "Retriever",
+    "SemanticQueryCache",
 ]
@@ -0,0 +1,66 @@
+"""
+on-disk cache of paper source search responses
+"""
+from pathlib import Path
+from typing import Callable, Optional
+import functools
+import hashlib
+import logging
+import time
+from src.config import get_config
+from src.utils import atomic_write, json_dumps, json_loads
+
+logger = logging.getLogger(__name__)
+
+SEARCH_CACHE_TTL = 24 * 3600  # seconds
+
+
+def search_cache_dir() -> Path:
+    """Directory of the search cache, under the configured CACHE_DIR"""
+    return Path(get_config().CACHE_DIR) / "search"
+
+
+def disk_cache(ttl: float = SEARCH_CACHE_TTL, cache_dir: Optional[str] = None) -> Callable:
+    """
+    Caches a source's search(query, top_k) results on disk for ttl seconds
+
+    Entries are keyed by (source class, query, top_k) and stored as JSON; the
+    file mtime is the entry's age. Empty results are not stored, since sources
+    return [] on failure. The wrapped method gains a force_refresh flag that
+    skips the lookup (and refreshes the entry).
+
+    Args:
+        ttl: entry lifetime in seconds
+        cache_dir: cache directory (default: search_cache_dir())
+    """
+    def decorator(search: Callable) -> Callable:
+        @functools.wraps(search)
+        def wrapper(self, query: str, top_k: int = 10, force_refresh: bool = False):
+            source = type(self).__name__
+            key = hashlib.blake2b(f"{source}:{query}:{top_k}".encode("utf-8"), digest_size=16).hexdigest()
+            directory = Path(cache_dir) if cache_dir else search_cache_dir()
+            path = directory / f"{key}.json"
+
+            if not force_refresh:
+                try:
+                    if time.time() - path.stat().st_mtime < ttl:
+                        papers = json_loads(path.read_bytes())
+                        logger.info("search cache hit: %s %r", source, query)
+                        return papers
+                    # expired, drop it so stale entries do not pile up
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                except (OSError, ValueError) as e:
+                    print(f"Warning: unreadable search cache {path}: {e}")
+
+            papers = search(self, query, top_k)
+            if papers:
+                try:
+                    directory.mkdir(parents=True, exist_ok=True)
+                    atomic_write(path, json_dumps(papers), fsync=False)
+                except OSError as e:
+                    print(f"Warning: could not write search cache {path}: {e}")
+            return papers
+        return wrapper
+    return decorator
@@ -1,17 +1,144 @@
 """
 paper sources management - manage paper from multi-sources
 """
-from typing import List, Dict, Optional, Tuple
+from typing import BinaryIO, List, Dict, Optional, Tuple, Union
 from abc import ABC, abstractmethod
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
 import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import copy
+import functools
+import io
 import re
+import asyncio
+import threading
+import time
 from src.core.web_search import get_searcher, SearchResult
+from src.utils import json_loads
+from ._cache import disk_cache
+
+# Atom namespace of the arXiv API, in ElementTree's {uri}tag form
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_ATOM_ENTRY = _ATOM + "entry"
+_ATOM_ID = _ATOM + "id"
+_ATOM_TITLE = _ATOM + "title"
+_ATOM_SUMMARY = _ATOM + "summary"
+_ATOM_PUBLISHED = _ATOM + "published"
+_ATOM_AUTHOR = _ATOM + "author"
+_ATOM_NAME = _ATOM + "name"
+_ATOM_LINK = _ATOM + "link"
+# ElementPath expressions, compiled once and cached by ElementTree
+_AUTHOR_NAMES_PATH = f"{_ATOM_AUTHOR}/{_ATOM_NAME}"
+_PDF_LINK_PATH = f"{_ATOM_LINK}[@title='pdf']"
+_ARXIV_ABS_ID_RE = re.compile(r'arxiv\.org/abs/(\d{4}\.\d{5}(v\d+)?)')
+# arXiv URLs (abs, pdf, or html versions), with or without a 'v' version suffix
+_ARXIV_URL_RE = re.compile(r'(?:arxiv\.org/(?:abs|pdf|html)/)(\d{4}\.\d{5}(?:v\d+)?)')
+# matched against the raw HTML bytes, no decode needed
+_PDF_HREF_RE = re.compile(rb'href="([^"]+?\.pdf)"')
+_BASE_URL_RE = re.compile(r'(https?://[^/]+)')
+
+# what sources put in place of a missing title; never an identity key
+_PLACEHOLDER_TITLES = frozenset({"", "n/a", "na", "none", "null", "unknown", "untitled"})
+
+
+# fetch_paper results kept in memory, shared by all source instances
+FETCH_CACHE_SIZE = 1024
+_FETCH_CACHE: "OrderedDict[Tuple[type, str], Dict]" = OrderedDict()
+_FETCH_CACHE_LOCK = threading.Lock()
+
+
+def _cached_fetch(fetch):
+    """
+    LRU-cache a source's fetch_paper, keyed by (source class, paper id)
+    
+    Only found papers are cached, a failed or empty lookup is retried next
+    time. Callers get a copy, so mutating a result does not touch the cache.
+    """
+    @functools.wraps(fetch)
+    def wrapper(self, paper_id: str) -> Optional[Dict]:
+        key = (type(self), paper_id)
+        with _FETCH_CACHE_LOCK:
+            if key in _FETCH_CACHE:
+                _FETCH_CACHE.move_to_end(key)
+                return copy.deepcopy(_FETCH_CACHE[key])
+        
+        paper = fetch(self, paper_id)
+        if paper is not None:
+            with _FETCH_CACHE_LOCK:
+                _FETCH_CACHE[key] = copy.deepcopy(paper)
+                _FETCH_CACHE.move_to_end(key)
+                while len(_FETCH_CACHE) > FETCH_CACHE_SIZE:
+                    _FETCH_CACHE.popitem(last=False)
+        return paper
+    return wrapper
+
+
+def make_session(pool_connections: int = 16, pool_maxsize: int = 32, retries: int = 3) -> requests.Session:
+    """
+    requests session with pooled keep-alive connections and retries
+    
+    Args:
+        pool_connections: number of hosts to keep connection pools for
+        pool_maxsize: connections kept per host
+        retries: retries of a failed connection or a 429/5xx response, with
+            backoff (a Retry-After header is honoured)
+        
+    Returns:
+        requests.Session
+    """
+    session = requests.Session()
+    retry = Retry(
+        total=retries,
+        backoff_factor=0.3,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
 
 class PaperSource(ABC):
     """paper sourcess"""
     
+    # concurrent searches PaperSourceManager.search_many_async runs per source
+    MAX_CONCURRENCY = 8
+    # minimum seconds between two requests to the source's API
+    MIN_REQUEST_INTERVAL = 0.0
+    
+    def __init__(self, session: Optional[requests.Session] = None):
+        """
+        initialize
+        
+        Args:
+            session: HTTP session shared between sources (a new one when None)
+        """
+        self.session = session or make_session()
+        self._rate_lock = threading.Lock()
+        self._next_request = 0.0
+    
+    def _wait_for_turn(self):
+        """blocks until MIN_REQUEST_INTERVAL has passed since the previous request"""
+        if self.MIN_REQUEST_INTERVAL <= 0:
+            return
+        with self._rate_lock:
+            now = time.monotonic()
+            if self._next_request > now:
+                time.sleep(self._next_request - now)
+                now = self._next_request
+            self._next_request = now + self.MIN_REQUEST_INTERVAL
+    
     @abstractmethod
     def search(self, query: str, top_k: int = 10) -> List[Dict]:
         """search paper by query"""
@@ -28,6 +155,11 @@ class ArxivSource(PaperSource):
     
     BASE_URL = "http://export.arxiv.org/api/query"
     
+    # arXiv API terms: one connection at a time, no more than one request every 3 seconds
+    MAX_CONCURRENCY = 1
+    MIN_REQUEST_INTERVAL = 3.0
+    
+    @disk_cache()
     def search(self, query: str, top_k: int = 10) -> List[Dict]:
         """search paper from arXiv source by query"""
         try:
@@ -39,61 +171,63 @@ class ArxivSource(PaperSource):
                 "sortOrder": "descending",
             }
             
-            response = requests.get(self.BASE_URL, params=params, timeout=60)
-            response.raise_for_status()
-            
-            papers = self._parse_arxiv_response(response.text)
+            self._wait_for_turn()
+            # feed the socket straight to the XML parser, no full-body copy
+            with self.session.get(self.BASE_URL, params=params, timeout=60, stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                papers = self._parse_arxiv_response(response.raw)
             return papers
         except Exception as e:
             print(f"arXiv search failed: {e}")
             return []
     
+    @_cached_fetch
     def fetch_paper(self, paper_id: str) -> Optional[Dict]:
         """fetch paper detail from arXiv by paper id"""
         try:
             params = {"search_query": f"arxiv:{paper_id}", "max_results": 1}
-            response = requests.get(self.BASE_URL, params=params, timeout=10)
-            response.raise_for_status()
-            
-            papers = self._parse_arxiv_response(response.text)
+            self._wait_for_turn()
+            with self.session.get(self.BASE_URL, params=params, timeout=10, stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                papers = self._parse_arxiv_response(response.raw)
             return papers[0] if papers else None
         except Exception as e:
             print(f"fetch arXiv paper failed: {e}")
             return None
 
     @staticmethod
-    def _parse_arxiv_response(response_text: str) -> List[Dict]:
-        """parse arXiv API response"""
+    def _parse_arxiv_response(response_text: Union[str, bytes, BinaryIO]) -> List[Dict]:
+        """parse arXiv API response (text, raw bytes or a binary stream)"""
         papers = []
+        if isinstance(response_text, str):
+            response_text = response_text.encode("utf-8")
+        source = io.BytesIO(response_text) if isinstance(response_text, bytes) else response_text
         try:
-            root = ET.fromstring(response_text)
-            
-            # Define namespace
-            ns = {'atom': 'http://www.w3.org/2005/Atom'}
-            
-            for entry in root.findall('atom:entry', ns):
+            # stream the feed entry by entry instead of building the whole tree
+            for _, entry in ET.iterparse(source, events=("end",)):
+                if entry.tag != _ATOM_ENTRY:
+                    continue
+                
                 paper_id = None
-                url = ""
-                id_tag = entry.find('atom:id', ns)
-                if id_tag is not None and id_tag.text:
-                    url = id_tag.text
+                url = entry.findtext(_ATOM_ID) or ""
+                if url:
                     # Extract arxiv id from the URL
-                    match = re.search(r'arxiv\.org/abs/(\d{4}\.\d{5}(v\d+)?)', id_tag.text)
+                    match = _ARXIV_ABS_ID_RE.search(url)
                     if match:
                         paper_id = match.group(1)
                 
-                title = entry.find('atom:title', ns).text if entry.find('atom:title', ns) is not None else "N/A"
-                summary = entry.find('atom:summary', ns).text if entry.find('atom:summary', ns) is not None else "N/A"
-                published_date = entry.find('atom:published', ns).text if entry.find('atom:published', ns) is not None else "N/A"
+                title = entry.findtext(_ATOM_TITLE, "N/A")
+                summary = entry.findtext(_ATOM_SUMMARY, "N/A")
+                published_date = entry.findtext(_ATOM_PUBLISHED, "N/A")
                 
-                authors = [author.find('atom:name', ns).text for author in entry.findall('atom:author', ns) if author.find('atom:name', ns) is not None]
+                # one walk over author/name children
+                authors = [name.text or "" for name in entry.iterfind(_AUTHOR_NAMES_PATH)]
                 
-                pdf_url = None
                 # Arxiv provides multiple links, typically one with rel='alternate' for HTML and one with rel='related' and type='application/pdf' for PDF
-                for link in entry.findall('atom:link', ns):
-                    if 'title' in link.attrib and link.attrib['title'] == 'pdf':
-                        pdf_url = link.attrib['href']
-                        break
+                pdf_link = entry.find(_PDF_LINK_PATH)
+                pdf_url = pdf_link.get('href') if pdf_link is not None else None
                 
                 papers.append({
                     "paper_id": paper_id,
@@ -105,6 +239,8 @@ class ArxivSource(PaperSource):
                     "source": "arxiv",
                     "published_date": published_date,
                 })
+                # drop the parsed entry's subtree
+                entry.clear()
         except ET.ParseError as e:
             print(f"Error parsing arXiv XML response: {e}")
         except Exception as e:
@@ -114,8 +250,13 @@ class ArxivSource(PaperSource):
 
 class WebSource(PaperSource):
     """websearch paper source"""
-    def __init__(self, prefer_engine: str = "speedbird"):
+    
+    # concurrent landing-page fetches in _parse_web_papers
+    HTML_FETCH_WORKERS = 8
+    
+    def __init__(self, prefer_engine: str = "speedbird", session: Optional[requests.Session] = None):
         """initialize"""
+        super().__init__(session)
         self.searcher = get_searcher(prefer_engine = prefer_engine)
 
     def search(self, query: str, top_k: int = 10) -> List[Dict]:
@@ -132,11 +273,13 @@ class WebSource(PaperSource):
         """fetch paper detail from websearch by paper id"""
         print("not implemented")
         pass
+
     def _parse_web_papers(self, search_result: SearchResult):
-        papers = []
-        for result in search_result:
-            try: 
-                paper_id, pdf_url = None, None
+        # pass 1: resolve direct PDF links, collect the hits that need their HTML page
+        resolved = []
+        to_fetch = []
+        for i, result in enumerate(search_result):
+            try:
                 url = result.url
                 # Extract arxiv id from the URL
                 paper_id, pdf_url = self._parse_url_for_arxiv_id(url)
@@ -146,13 +289,30 @@ class WebSource(PaperSource):
                     if url.endswith("pdf"):
                         pdf_url = url
                 if not pdf_url:
+                    to_fetch.append((i, url))
+                resolved.append((i, result, paper_id, pdf_url))
+            except Exception as e:
+                print(f"An unexpected error occurred during web papere parsing: {e}")
+        
+        # pass 2: fetch the pages concurrently
+        fetched = {}
+        if to_fetch:
+            workers = min(self.HTML_FETCH_WORKERS, len(to_fetch))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                contents = executor.map(self._fetch_page, [url for _, url in to_fetch])
+                fetched = dict(zip([i for i, _ in to_fetch], contents))
+        
+        # pass 3: assemble papers in search order
+        papers = []
+        for i, result, paper_id, pdf_url in resolved:
+            try:
+                url = result.url
+                direct_pdf_url, html_content = fetched.get(i, (None, None))
+                if not pdf_url and direct_pdf_url:
+                    pdf_url = direct_pdf_url
+                if not pdf_url and html_content is not None:
                     try:
-                        response = requests.get(url, timeout=10)
-                        response.raise_for_status()
-                        html_content = response.text
                         pdf_url = self._extract_pdf_info_from_html(html_content, url)
-                    except requests.exceptions.RequestException as req_e:
-                        print(f"Failed to fetch content from {url}: {req_e}")
                     except Exception as html_e:
                         print(f"Error parsing HTML from {url}: {html_e}")
 
@@ -177,41 +337,76 @@ class WebSource(PaperSource):
                 print(f"An unexpected error occurred during web papere parsing: {e}")
         return papers
 
-    def _parse_url_for_arxiv_id(self, url: str):
+    def _fetch_page(self, url: str) -> Tuple[Optional[str], Optional[bytes]]:
+        """
+        Looks up a search hit that has no obvious PDF link
+        
+        A HEAD request comes first: a PDF served under another extension is
+        taken as is, and non-HTML pages are skipped, both without a body
+        download. Only HTML pages (or servers refusing HEAD) are fetched.
+        
+        Returns:
+            Tuple[Optional[str], Optional[bytes]]: (direct PDF url, raw HTML body)
+        """
+        try:
+            head = self.session.head(url, allow_redirects=True, timeout=5)
+            if head.ok:
+                content_type = head.headers.get("Content-Type", "").lower()
+                if "pdf" in content_type:
+                    return head.url, None
+                if content_type and "html" not in content_type:
+                    return None, None
+        except requests.exceptions.RequestException:
+            # some servers reject or mishandle HEAD, let the GET decide
+            pass
+        
+        try:
+            response = self.session.get(url, timeout=10)
+            response.raise_for_status()
+            return None, response.content
+        except requests.exceptions.RequestException as req_e:
+            print(f"Failed to fetch content from {url}: {req_e}")
+            return None, None
+
+    @staticmethod
+    @functools.lru_cache(maxsize=8192)
+    def _parse_url_for_arxiv_id(url: str):
         """
         Parses a URL to extract an arXiv paper ID and constructs a PDF URL.
         Returns (paper_id, pdf_url) or (None, None) if not an arXiv URL.
         """
-        # Regex to match arXiv URLs (abs, pdf, or html versions)
-        # It handles both 'v' versions (e.g., 1234.56789v1) and non-'v' versions
-        arxiv_id_match = re.search(r'(?:arxiv.org/(?:abs|pdf|html)/)(\d{4}.\d{5}(?:v\d+)?)', url)
+        arxiv_id_match = _ARXIV_URL_RE.search(url)
         if arxiv_id_match:
             paper_id = arxiv_id_match.group(1)
             pdf_url = f"https://arxiv.org/pdf/{paper_id}.pdf"
             return paper_id, pdf_url
         return None, None
 
-    def _is_pdf_url(self,url: str) -> bool:
+    @staticmethod
+    @functools.lru_cache(maxsize=8192)
+    def _is_pdf_url(url: str) -> bool:
         """
         Checks if a URL points directly to a PDF file.
         """
         return url.strip().lower().endswith('.pdf')
     
     @staticmethod
-    def _extract_pdf_info_from_html(html_content: str, original_url: str) -> Tuple[Optional[str], Optional[str]]:
+    def _extract_pdf_info_from_html(html_content: Union[bytes, str], original_url: str) -> Tuple[Optional[str], Optional[str]]:
         """
         Extracts PDF URL and paper ID from HTML content for specific sources.
         Currently handles aclanthology.org.
         """
         pdf_url = None
+        if isinstance(html_content, str):
+            html_content = html_content.encode("utf-8")
         # Try to find PDF link
         # Common pattern for aclanthology.org: <a class="btn btn-primary btn-md" href="/pdf/...">PDF</a>
-        pdf_match = re.search(r'href="(.*?\.pdf)"', html_content)
+        pdf_match = _PDF_HREF_RE.search(html_content)
         if pdf_match:
-            pdf_path = pdf_match.group(1)
+            pdf_path = pdf_match.group(1).decode("utf-8", errors="replace")
             # aclanthology uses relative paths or full paths. Normalize to full URL.
             if pdf_path.startswith('/'):
-                base_url = re.match(r'(https?://[^/]+)', original_url)
+                base_url = _BASE_URL_RE.match(original_url)
                 if base_url:
                     pdf_url = base_url.group(1) + pdf_path
             else:
@@ -226,10 +421,12 @@ class SemanticScholarSource(PaperSource):
     
     BASE_URL = "https://api.semanticscholar.org/graph/v1/paper/search"
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, session: Optional[requests.Session] = None):
         """initialize"""
+        super().__init__(session)
         self.api_key = api_key
     
+    @disk_cache()
     def search(self, query: str, top_k: int = 10) -> List[Dict]:
         """search paper form Semantic Scholar"""
         try:
@@ -243,25 +440,26 @@ class SemanticScholarSource(PaperSource):
             if self.api_key:
                 headers["x-api-key"] = self.api_key
             
-            response = requests.get(self.BASE_URL, params=params, headers=headers, timeout=10)
+            response = self.session.get(self.BASE_URL, params=params, headers=headers, timeout=10)
             response.raise_for_status()
             
-            data = response.json()
+            data = json_loads(response.content)
             papers = self._parse_response(data)
             return papers
         except Exception as e:
             print(f"Semantic Scholar search failed: {e}")
             return []
     
+    @_cached_fetch
     def fetch_paper(self, paper_id: str) -> Optional[Dict]:
         """fetch paper details"""
         url = f"https://api.semanticscholar.org/graph/v1/paper/{paper_id}"
         try:
             params = {"fields": "paperId,title,authors,abstract,url,year"}
-            response = requests.get(url, params=params, timeout=10)
+            response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
             
-            data = response.json()
+            data = json_loads(response.content)
             return self._format_paper(data)
         except Exception as e:
             print(f"fetch paper failed: {e}")
@@ -299,6 +497,7 @@ class HuggingFaceSource(PaperSource):
     
     BASE_URL = "https://huggingface.co/api"
     
+    @disk_cache()
     def search(self, query: str, top_k: int = 10) -> List[Dict]:
         """search model of Hugging Face"""
         try:
@@ -306,24 +505,25 @@ class HuggingFaceSource(PaperSource):
             url = f"{self.BASE_URL}/models"
             params = {"search": query, "sort": "downloads", "limit": top_k}
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
             
-            models = response.json()
+            models = json_loads(response.content)
             papers = self._format_models(models)
             return papers
         except Exception as e:
             print(f"Hugging Face search failed: {e}")
             return []
     
+    @_cached_fetch
     def fetch_paper(self, paper_id: str) -> Optional[Dict]:
         """fetch paper details"""
         try:
             url = f"{self.BASE_URL}/models/{paper_id}"
-            response = requests.get(url, timeout=10)
+            response = self.session.get(url, timeout=10)
             response.raise_for_status()
             
-            model = response.json()
+            model = json_loads(response.content)
             return self._format_model(model)
         except Exception as e:
             print(f"fetch model failed: {e}")
@@ -361,11 +561,13 @@ class PaperSourceManager:
     
     def __init__(self):
         """initialize"""
+        # one connection pool for every source, so TCP/TLS setups are reused
+        self.session = make_session()
         self.sources: Dict[str, PaperSource] = {
-            "arxiv": ArxivSource(),
-            "semantic_scholar": SemanticScholarSource(),
-            "huggingface": HuggingFaceSource(),
-            "web": WebSource(),
+            "arxiv": ArxivSource(session=self.session),
+            "semantic_scholar": SemanticScholarSource(session=self.session),
+            "huggingface": HuggingFaceSource(session=self.session),
+            "web": WebSource(session=self.session),
         }
     
     def register_source(self, name: str, source: PaperSource):
@@ -374,15 +576,143 @@ class PaperSourceManager:
     
     def search_all(self, query: str, top_k: int = 10) -> Dict[str, List[Dict]]:
         """search in all sources"""
-        results = {}
-        for source_name, source in self.sources.items():
-            try:
-                papers = source.search(query, top_k=top_k)
-                results[source_name] = papers
-            except Exception as e:
-                print(f"{source_name} search failed: {e}")
-                results[source_name] = []
+        if not self.sources:
+            return {}
+        
+        # sources hit different hosts, so run them concurrently: latency is the slowest source
+        with ThreadPoolExecutor(max_workers=len(self.sources)) as executor:
+            futures = {
+                source_name: executor.submit(source.search, query, top_k=top_k)
+                for source_name, source in self.sources.items()
+            }
+            results = {
+                source_name: self._safe_result(source_name, future)
+                for source_name, future in futures.items()
+            }
+        
+        self._drop_cross_source_duplicates(results)
+        return results
+    
+    @staticmethod
+    def _paper_keys(paper: Dict) -> List[str]:
+        """
+        identity keys of a paper: its arXiv id (without version) and its
+        normalized title, or its urls / source id when the title is missing
+        or a placeholder such as "N/A"
+        """
+        keys = []
+        for field in ("pdf_url", "url"):
+            match = _ARXIV_URL_RE.search(paper.get(field) or "")
+            if match:
+                keys.append("arxiv:" + match.group(1).split("v")[0])
+                break
+        title = " ".join((paper.get("title") or "").lower().split())
+        if title not in _PLACEHOLDER_TITLES:
+            keys.append("title:" + title)
+        else:
+            for field in ("pdf_url", "url"):
+                url = (paper.get(field) or "").strip().rstrip("/")
+                if url:
+                    keys.append("url:" + url)
+            if paper.get("paper_id"):
+                keys.append(f"id:{paper.get('source', '')}:{paper['paper_id']}")
+        return keys
+    
+    @classmethod
+    def _drop_cross_source_duplicates(cls, results: Dict[str, List[Dict]]):
+        """
+        Removes papers already returned by an earlier source, in place
+        
+        Papers match on arXiv id or on normalized title, so an arXiv hit and
+        the same paper from Semantic Scholar (no arXiv link) still collapse;
+        untitled papers match on url or source id only. The first
+        occurrence, in source order, is kept.
+        """
+        seen = set()
+        for source_name, papers in results.items():
+            kept = []
+            for paper in papers:
+                keys = cls._paper_keys(paper)
+                if any(key in seen for key in keys):
+                    continue
+                seen.update(keys)
+                kept.append(paper)
+            papers[:] = kept
+    
+    @staticmethod
+    def _safe_result(source_name: str, future) -> List[Dict]:
+        """result of a source search, [] if it raised"""
+        try:
+            return future.result()
+        except Exception as e:
+            print(f"{source_name} search failed: {e}")
+            return []
+    
+    def search_many(
+        self,
+        queries: List[str],
+        sources: List[str],
+        top_k: int = 10,
+    ) -> Dict[str, Dict[str, List[Dict]]]:
+        """
+        search every query in every source at once (sync shim of search_many_async)
+        
+        Args:
+            queries: query list
+            sources: source names
+            top_k: results per query and source
+            
+        Returns:
+            Dict[str, Dict[str, List[Dict]]]: papers by query, then by source
+        """
+        return asyncio.run(self.search_many_async(queries, sources, top_k))
+    
+    async def search_many_async(
+        self,
+        queries: List[str],
+        sources: List[str],
+        top_k: int = 10,
+    ) -> Dict[str, Dict[str, List[Dict]]]:
+        """
+        search every query in every source concurrently
+        
+        The sources are blocking clients over one pooled session, so each
+        (query, source) call runs in a worker thread and all of them are
+        gathered together: wall time is the slowest call, not the sum.
+        At most MAX_CONCURRENCY calls per source run at once (arXiv: one,
+        paced by its MIN_REQUEST_INTERVAL), so rate-limited APIs are not
+        flooded and their waits do not tie up the worker threads.
+        A failing call yields [] for its pair.
+        
+        Args:
+            queries: query list
+            sources: source names
+            top_k: results per query and source
+            
+        Returns:
+            Dict[str, Dict[str, List[Dict]]]: papers by query, then by source
+        """
+        pairs = [(query, source) for query in dict.fromkeys(queries) for source in sources]
+        limits = {
+            source: asyncio.Semaphore(getattr(self.sources.get(source), "MAX_CONCURRENCY", 1))
+            for source in sources
+        }
+        
+        async def search(query: str, source: str) -> List[Dict]:
+            async with limits[source]:
+                return await asyncio.to_thread(self.search_specific, source, query, top_k)
+        
+        found = await asyncio.gather(
+            *(search(query, source) for query, source in pairs),
+            return_exceptions=True,
+        )
         
+        results: Dict[str, Dict[str, List[Dict]]] = {}
+        for (query, source), papers in zip(pairs, found):
+            if isinstance(papers, Exception):
+                print(f"{source} search failed: {papers}")
+                papers = []
+            results.setdefault(query, {})[source] = papers
         return results
     
     def search_specific(self, source_name: str, query: str, top_k: int = 10) -> List[Dict]:
@@ -0,0 +1,154 @@
+"""
+semantic query cache - reuse search results of near-duplicate sub-queries
+"""
+from typing import Dict, List, Optional, Sequence
+import threading
+import time
+import numpy as np
+from src.utils import json_dumps, json_loads
+
+
+class SemanticQueryCache:
+    """
+    In-memory cache of search results keyed by query embedding
+
+    A lookup returns the results stored for the most similar earlier query
+    (cosine similarity >= threshold) that was searched with the same sources
+    and top_k and has not expired. Vectors are L2-normalized on insert, so
+    similarity is a single matrix-vector product over all entries.
+    """
+
+    def __init__(self, threshold: float = 0.92, ttl: float = 3600, max_entries: int = 1024):
+        """
+        initialize
+
+        Args:
+            threshold: minimum cosine similarity for a hit
+            ttl: entry lifetime in seconds
+            max_entries: entries kept; the oldest are dropped first
+        """
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._vectors: Optional[np.ndarray] = None  # (n, dim), unit rows
+        self._namespaces: List[tuple] = []
+        self._blobs: List[bytes] = []
+        self._inserted_at: List[float] = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(embedding: Optional[Sequence[float]]) -> Optional[np.ndarray]:
+        """unit vector of an embedding, None for a missing or zero one"""
+        if embedding is None or len(embedding) == 0:
+            return None
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else None
+
+    @staticmethod
+    def _namespace(sources: Sequence[str], top_k: int) -> tuple:
+        return tuple(sources), top_k
+
+    def get(self, embedding: Optional[Sequence[float]], sources: Sequence[str], top_k: int) -> Optional[Dict[str, List[Dict]]]:
+        """
+        results cached for a near-duplicate query
+
+        Args:
+            embedding: embedding of the query
+            sources: source names the query is searched in
+            top_k: results per source
+
+        Returns:
+            Optional[Dict[str, List[Dict]]]: papers by source (fresh copies), None on a miss
+        """
+        vector = self._normalize(embedding)
+        if vector is None:
+            return None
+
+        namespace = self._namespace(sources, top_k)
+        with self._lock:
+            if self._vectors is None or self._vectors.shape[1] != vector.shape[0]:
+                return None
+            scores = self._vectors @ vector
+            cutoff = time.time() - self.ttl
+            for i, (entry_namespace, inserted_at) in enumerate(zip(self._namespaces, self._inserted_at)):
+                if entry_namespace != namespace or inserted_at < cutoff:
+                    scores[i] = -1.0
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                return None
+            blob = self._blobs[best]
+        return json_loads(blob)
+
+    def group(self, embeddings: Sequence[Optional[Sequence[float]]]) -> List[int]:
+        """
+        groups near-duplicate queries among themselves
+
+        Each query joins the group of the first earlier query it is at least
+        threshold-similar to; otherwise it starts a group of its own.
+
+        Args:
+            embeddings: embeddings of the queries (None for a missing one)
+
+        Returns:
+            List[int]: index of each query's group leader (its own index for leaders)
+        """
+        vectors = [self._normalize(embedding) for embedding in embeddings]
+        leaders: List[int] = []
+        group_of = []
+        for i, vector in enumerate(vectors):
+            leader = i
+            if vector is not None:
+                for j in leaders:
+                    if vectors[j].shape == vector.shape and float(vectors[j] @ vector) >= self.threshold:
+                        leader = j
+                        break
+            if leader == i and vector is not None:
+                leaders.append(i)
+            group_of.append(leader)
+        return group_of
+
+    def put(self, embedding: Optional[Sequence[float]], sources: Sequence[str], top_k: int, results: Dict[str, List[Dict]]):
+        """
+        store the results of a query
+
+        Args:
+            embedding: embedding of the query
+            sources: source names the query was searched in
+            top_k: results per source
+            results: papers by source
+        """
+        vector = self._normalize(embedding)
+        # sources return [] on failure, do not serve that to similar queries
+        if vector is None or not any(results.values()):
+            return
+
+        blob = json_dumps(results)
+        now = time.time()
+        with self._lock:
+            if self._vectors is not None and self._vectors.shape[1] != vector.shape[0]:
+                # the embedding model changed, old vectors are not comparable
+                self._clear()
+            # drop expired entries, then the oldest beyond capacity
+            keep = [i for i, inserted_at in enumerate(self._inserted_at) if inserted_at >= now - self.ttl]
+            keep = keep[-(self.max_entries - 1):] if self.max_entries > 1 else []
+            if self._vectors is not None and len(keep) != len(self._blobs):
+                self._vectors = self._vectors[keep] if keep else None
+                self._namespaces = [self._namespaces[i] for i in keep]
+                self._blobs = [self._blobs[i] for i in keep]
+                self._inserted_at = [self._inserted_at[i] for i in keep]
+
+            row = vector[np.newaxis, :]
+            self._vectors = row if self._vectors is None else np.vstack([self._vectors, row])
+            self._namespaces.append(self._namespace(sources, top_k))
+            self._blobs.append(blob)
+            self._inserted_at.append(now)
+
+    def _clear(self):
+        self._vectors = None
+        self._namespaces = []
+        self._blobs = []
+        self._inserted_at = []
+
+    def __len__(self) -> int:
+        return len(self._blobs)
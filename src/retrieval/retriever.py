@@ -2,12 +2,16 @@
 retriever - including multi retrieval approach
 """
 from typing import List, Dict, Optional
+import logging
 from rank_bm25 import BM25Okapi
 from .semantic_search import SemanticSearcher
 from .paper_sources import PaperSourceManager
+from .query_cache import SemanticQueryCache
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 
+logger = logging.getLogger(__name__)
+
 class Retriever:
     """main retriever"""
     
@@ -21,6 +25,8 @@ class Retriever:
         self.source_manager = PaperSourceManager()
         self.semantic_searcher = SemanticSearcher() if use_semantic_search else None
         self.embedding_client = embedding_client
+        # paraphrased sub-queries reuse earlier results (needs embeddings)
+        self.query_cache = SemanticQueryCache() if embedding_client else None
     
     def _deduplicate_by_similarity(self, papers: List[Dict], key: str, threshold: float = 0.95):
         # 5.1. embedding-based deduplication
@@ -57,6 +63,47 @@ class Retriever:
                 deduped_papers.append(paper)
         return deduped_papers
 
+    def _fetch_sub_queries(self, queries: List[str], sources: List[str], top_k: int) -> Dict[str, Dict[str, List[Dict]]]:
+        """
+        papers of each sub-query by source, from the semantic cache or the sources
+
+        Args:
+            queries: sub-queries
+            sources: source names
+            top_k: results per query and source
+
+        Returns:
+            Dict[str, Dict[str, List[Dict]]]: papers by query, then by source
+        """
+        unique_queries = list(dict.fromkeys(queries))
+        if self.query_cache is None:
+            return self.source_manager.search_many(unique_queries, sources, top_k=top_k)
+
+        embeddings = self.embedding_client.get_embeddings(unique_queries) or []
+        embedding_of = dict(zip(unique_queries, embeddings))
+
+        fetched = {}
+        misses = []
+        for query in unique_queries:
+            cached = self.query_cache.get(embedding_of.get(query), sources, top_k)
+            if cached is not None:
+                fetched[query] = cached
+            else:
+                misses.append(query)
+        if len(misses) < len(unique_queries):
+            logger.info("%d sub-queries served from the query cache", len(unique_queries) - len(misses))
+
+        if misses:
+            # paraphrases within this call are fetched once, by their group leader
+            group_of = self.query_cache.group([embedding_of.get(query) for query in misses])
+            leaders = [query for i, query in enumerate(misses) if group_of[i] == i]
+            found = self.source_manager.search_many(leaders, sources, top_k=top_k)
+            for i, query in enumerate(misses):
+                results = found.get(misses[group_of[i]], {})
+                self.query_cache.put(embedding_of.get(query), sources, top_k, results)
+                fetched[query] = results
+        return fetched
+
     def search(
         self,
         original_query: str,
@@ -84,12 +131,16 @@ class Retriever:
         merged_top_papers = []
         return_result = {"sub_query": {}, "original_query": []}
         
+        # every (sub-query, source) request goes out at once; ranking below is local
+        fetched = self._fetch_sub_queries(queries, sources, top_k)
+        
         # 1. Per-subquery processing
         for query in queries:
             # a. Retrieve documents
             query_papers = []
             for source in sources:
-                papers = self.source_manager.search_specific(source, query, top_k=top_k) # Fetch more to have enough after dedup
+                # copies, a repeated sub-query must not share paper dicts
+                papers = [dict(paper) for paper in fetched.get(query, {}).get(source, [])]
                 query_papers.extend(papers)
             
             # b. Deduplicate by url, then title
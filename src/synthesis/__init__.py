@@ -2,10 +2,11 @@
 Synthesis module
 """
 
-from .aggregator import Aggregator
+from .aggregator import Aggregator, PaperColumnarView
 from .summarizer import Summarizer
 
 __all__ = [
     "Aggregator",
+    "PaperColumnarView",
     "Summarizer",
 ]
@@ -1,13 +1,81 @@
 """
 Cross-paper aggregation module
 """
-from typing import List, Dict
+import re
+from typing import List, Dict, Optional, Sequence
 from collections import defaultdict
 from src.pdf_management.parser import ExtractedInfo
 import numpy as np
 from sklearn.cluster import KMeans
 from string import Template
 
+_ITEM_SPLIT_RE = re.compile(r"[;,\n]")
+
+
+def _as_items(value) -> List:
+    """Normalize a list field or a delimited string field into a list of items"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [item.strip() for item in _ITEM_SPLIT_RE.split(value) if item.strip()]
+    return list(value)
+
+
+def _first_attr(paper, names: Sequence[str], default=None):
+    """Value of the first of names the paper has (ExtractedInfo and structured papers name fields differently)"""
+    for name in names:
+        if hasattr(paper, name):
+            return getattr(paper, name)
+    return default
+
+
+class PaperColumnarView:
+    """
+    Column-oriented view of structured papers.
+    
+    Built once per synthesis so that the summarizer and the aggregator read
+    the same parallel lists instead of each walking the paper objects again.
+    """
+    
+    def __init__(self):
+        self.paper_ids: List[str] = []
+        self.titles: List[str] = []
+        self.urls: List[str] = []
+        self.abstracts: List[str] = []
+        self.objectives: List[str] = []
+        self.methods_per_paper: List = []
+        self.datasets_per_paper: List = []
+        self.metrics_per_paper: List = []
+        self.keywords_per_paper: List = []
+        self.models: List = []
+        self.contributions: List = []
+        self.citations: List[int] = []
+        self.url_index: Dict[str, int] = {}
+    
+    @classmethod
+    def from_papers(cls, papers: List[ExtractedInfo]) -> "PaperColumnarView":
+        """Builds the view with a single pass over the papers"""
+        view = cls()
+        for idx, paper in enumerate(papers):
+            view.paper_ids.append(getattr(paper, "paper_id", ""))
+            view.titles.append(paper.title)
+            view.urls.append(paper.url)
+            view.abstracts.append(paper.abstract)
+            view.objectives.append(getattr(paper, "objectives", ""))
+            view.methods_per_paper.append(_first_attr(paper, ("methodology", "methods")))
+            view.datasets_per_paper.append(getattr(paper, "datasets", None))
+            view.metrics_per_paper.append(_first_attr(paper, ("evaluation", "results")))
+            view.keywords_per_paper.append(getattr(paper, "keywords", None))
+            view.models.append(getattr(paper, "models", ""))
+            view.contributions.append(getattr(paper, "contributions", None))
+            view.citations.append(getattr(paper, "citations_count", 0))
+            view.url_index.setdefault(paper.url, idx)
+        return view
+    
+    def __len__(self) -> int:
+        return len(self.titles)
+
+
 class Aggregator:
     """Cross-paper aggregator"""
     
@@ -43,132 +111,190 @@ class Aggregator:
         
         return dict(clustered_papers)
     
-    def aggregate_methods(self, papers: List[ExtractedInfo]) -> Dict[str, int]:
+    @staticmethod
+    def _view(papers: Optional[List[ExtractedInfo]], view: Optional[PaperColumnarView]) -> PaperColumnarView:
+        """The given view, or one built from papers"""
+        if view is None:
+            view = PaperColumnarView.from_papers(papers or [])
+        return view
+    
+    def aggregate_methods(
+        self,
+        papers: Optional[List[ExtractedInfo]] = None,
+        view: Optional[PaperColumnarView] = None,
+    ) -> Dict[str, int]:
         """
         Aggregates methods used across all papers
         
         Args:
             papers: List of papers
+            view: Prebuilt columnar view of the papers (used instead of papers)
             
         Returns:
             Dict: Method frequency statistics
         """
         method_count = defaultdict(int)
         
-        for paper in papers:
-            for method in paper.methods:
-                method_count[method.name] += 1
+        for methods in self._view(papers, view).methods_per_paper:
+            for method in _as_items(methods):
+                method_count[getattr(method, "name", method)] += 1
         
         return dict(sorted(method_count.items(), key=lambda x: x[1], reverse=True))
     
-    def aggregate_datasets(self, papers: List[ExtractedInfo]) -> Dict[str, int]:
+    def aggregate_datasets(
+        self,
+        papers: Optional[List[ExtractedInfo]] = None,
+        view: Optional[PaperColumnarView] = None,
+    ) -> Dict[str, int]:
         """
         Aggregates datasets used across all papers
         
         Args:
             papers: List of papers
+            view: Prebuilt columnar view of the papers (used instead of papers)
             
         Returns:
             Dict: Dataset frequency statistics
         """
         dataset_count = defaultdict(int)
         
-        for paper in papers:
-            for dataset in paper.datasets:
+        for datasets in self._view(papers, view).datasets_per_paper:
+            for dataset in _as_items(datasets):
                 dataset_count[dataset] += 1
         
         return dict(sorted(dataset_count.items(), key=lambda x: x[1], reverse=True))
     
-    def aggregate_metrics(self, papers: List[ExtractedInfo]) -> Dict[str, List[float]]:
+    def aggregate_metrics(
+        self,
+        papers: Optional[List[ExtractedInfo]] = None,
+        view: Optional[PaperColumnarView] = None,
+    ) -> Dict[str, List[float]]:
         """
         Aggregates evaluation metrics across all papers
         
         Args:
             papers: List of papers
+            view: Prebuilt columnar view of the papers (used instead of papers)
             
         Returns:
-            Dict: List of metric values
+            Dict: List of metric values (empty for metrics only named in free text)
         """
         metrics = defaultdict(list)
         
-        for paper in papers:
-            for result in paper.results:
-                metrics[result.metric].append(result.value)
+        for results in self._view(papers, view).metrics_per_paper:
+            for result in _as_items(results):
+                if hasattr(result, "metric"):
+                    metrics[result.metric].append(result.value)
+                else:
+                    # named in the evaluation text, no value
+                    metrics.setdefault(result, [])
         
         return dict(metrics)
     
-    def aggregate_keywords(self, papers: List[ExtractedInfo]) -> Dict[str, int]:
+    def aggregate_keywords(
+        self,
+        papers: Optional[List[ExtractedInfo]] = None,
+        view: Optional[PaperColumnarView] = None,
+    ) -> Dict[str, int]:
         """
         Aggregates keywords across all papers
         
         Args:
             papers: List of papers
+            view: Prebuilt columnar view of the papers (used instead of papers)
             
         Returns:
             Dict: Keyword frequency statistics
         """
         keyword_count = defaultdict(int)
         
-        for paper in papers:
-            for keyword in paper.keywords:
+        for keywords in self._view(papers, view).keywords_per_paper:
+            for keyword in _as_items(keywords):
                 keyword_count[keyword.lower()] += 1
         
         return dict(sorted(keyword_count.items(), key=lambda x: x[1], reverse=True))
     
-    def aggregate_contributions(self, papers: List[ExtractedInfo]) -> List[Dict]:
+    def aggregate_contributions(
+        self,
+        papers: Optional[List[ExtractedInfo]] = None,
+        view: Optional[PaperColumnarView] = None,
+    ) -> List[Dict]:
         """
         Aggregates contributions from all papers
         
         Args:
             papers: List of papers
+            view: Prebuilt columnar view of the papers (used instead of papers)
             
         Returns:
             List: List of contributions (with source information)
         """
+        view = self._view(papers, view)
         contributions = []
         
-        for paper in papers:
-            for contribution in paper.contributions:
+        for i in range(len(view)):
+            for contribution in _as_items(view.contributions[i]):
                 contributions.append({
                     "contribution": contribution,
-                    "paper_id": paper.paper_id,
-                    "paper_title": paper.title,
-                    "paper_url": paper.url,
+                    "paper_id": view.paper_ids[i],
+                    "paper_title": view.titles[i],
+                    "paper_url": view.urls[i],
                 })
         
         return contributions
 
-    def get_comparison_data(self, papers: List[ExtractedInfo]) -> List[Dict]:
+    def get_comparison_data(
+        self,
+        papers: Optional[List[ExtractedInfo]] = None,
+        view: Optional[PaperColumnarView] = None,
+        indices: Optional[Sequence[int]] = None,
+    ) -> List[Dict]:
         """
         Extracts data suitable for a comparative analysis table.
+        
+        Args:
+            papers: List of papers (kept for backward compatibility, prefer view)
+            view: Prebuilt columnar view of the papers
+            indices: Rows of the view to compare (all rows when omitted)
         """
-        comparison_data = []
-        for paper in papers:
-            comparison_data.append({
-                "title": paper.title,
-                "objectives": paper.objectives,
-                "methods": paper.methodology,
-                "contributions": paper.contributions,
-                "models": paper.models,
-            })
-        return comparison_data
+        view = self._view(papers, view)
+        if indices is None:
+            indices = range(len(view))
+        
+        return [
+            {
+                "title": view.titles[i],
+                "objectives": view.objectives[i],
+                "methods": view.methods_per_paper[i],
+                "contributions": view.contributions[i],
+                "models": view.models[i],
+            }
+            for i in indices
+        ]
     
-    def generate_summary(self, papers: List[ExtractedInfo]) -> Dict:
+    def generate_summary(
+        self,
+        papers: Optional[List[ExtractedInfo]] = None,
+        view: Optional[PaperColumnarView] = None,
+    ) -> Dict:
         """
         Generates summary statistics for a collection of papers
         
         Args:
-            papers: List of papers
+            papers: List of papers (kept for backward compatibility, prefer view)
+            view: Prebuilt columnar view of the papers
             
         Returns:
             Dict: Summary information
         """
+        view = self._view(papers, view)
+        
         return {
-            "total_papers": len(papers),
-            "top_methods": self.aggregate_methods(papers),
-            "top_datasets": self.aggregate_datasets(papers),
-            "metrics": self.aggregate_metrics(papers),
-            "top_keywords": self.aggregate_keywords(papers),
-            "contributions": self.aggregate_contributions(papers),
-            "avg_citations": sum(p.citations_count for p in papers) / len(papers) if papers else 0,
+            "total_papers": len(view),
+            "top_methods": self.aggregate_methods(view=view),
+            "top_datasets": self.aggregate_datasets(view=view),
+            "metrics": self.aggregate_metrics(view=view),
+            "top_keywords": self.aggregate_keywords(view=view),
+            "contributions": self.aggregate_contributions(view=view),
+            "avg_citations": sum(view.citations) / len(view) if len(view) else 0,
         }
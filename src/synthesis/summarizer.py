@@ -1,11 +1,11 @@
 """
 Multi-document comprehensive summarization module
 """
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 from src.core.concept_understanding import ConceptDefinition
 from src.pdf_management.parser import ExtractedInfo
-from src.synthesis.aggregator import Aggregator
+from src.synthesis.aggregator import Aggregator, PaperColumnarView
 from src.slm.slm_client import SLMClient
 from src.core.concept_understanding import AcademicQuery
 from string import Template
@@ -66,12 +66,18 @@ class Summarizer:
         concepts: ConceptDefinition,
         problem: AcademicQuery,
         sub_query_results: Dict[str, List[Dict]],
-        structured_papers: List[ExtractedInfo]
+        structured_papers: Optional[List[ExtractedInfo]] = None,
+        view: Optional[PaperColumnarView] = None,
     ) -> Dict:
         """
         Orchestrates the multi-layered synthesis process.
+        
+        `view` is the columnar form of the structured papers, shared with the
+        aggregator; `structured_papers` is still accepted and converted once.
         """
-        if not structured_papers:
+        if view is None:
+            view = PaperColumnarView.from_papers(structured_papers or [])
+        if not len(view):
             return {
                 "sub_query_synthesis": {},
                 "global_synthesis": {},
@@ -80,7 +86,7 @@ class Summarizer:
 
         # Layer 1: Generate a detailed comparative analysis for each sub-query
         sub_query_synthesis = self._synthesize_sub_queries(
-            sub_query_results, structured_papers
+            sub_query_results, view
         )
 
         # Layer 2: Generate a global synthesis, including a global comparative
@@ -95,17 +101,17 @@ class Summarizer:
         }
 
     def _synthesize_comparative_analysis(
-        self, query: str, papers_to_analyze: List[ExtractedInfo]
+        self, query: str, view: PaperColumnarView, indices: List[int]
     ) -> Dict:
         """
-        Core analysis engine: Takes a list of papers and returns a detailed
+        Core analysis engine: Takes rows of the paper view and returns a detailed
         comparative analysis report on them.
         """
-        print(f"  [Core Analysis] Performing comparative analysis on {len(papers_to_analyze)} papers...")
-        if not papers_to_analyze:
+        print(f"  [Core Analysis] Performing comparative analysis on {len(indices)} papers...")
+        if not indices:
             return {"error": "No papers provided to analyze."}
 
-        comparison_data = self.aggregator.get_comparison_data(papers_to_analyze)
+        comparison_data = self.aggregator.get_comparison_data(view=view, indices=indices)
         comparison_data = "<paper>" + "</paper><paper>".join([json.dumps(item) for item in comparison_data]) + "</paper>"
         
         prompt = subquery_paper_synthesis_template.substitute(query=query, paper_comparisons=comparison_data)  
@@ -123,25 +129,25 @@ class Summarizer:
     def _synthesize_sub_queries(
         self,
         sub_query_results: Dict[str, List[Dict]],
-        all_structured_papers: List[ExtractedInfo],
+        view: PaperColumnarView,
     ) -> Dict:
         """
         Generates a comparative analysis report for each sub-query (Layer 1).
         """
         print(" -> Layer 1: Generating comparative analysis for each sub-query...")
         all_sub_query_analyses = {}
-        paper_map_by_url = {paper.url: paper for paper in all_structured_papers}
 
         for sub_query, raw_results in sub_query_results.items():
             # Find the structured papers that match the raw results for this sub-query
-            papers_for_sub_query = []
-            for raw_paper in raw_results:
-                if raw_paper.get('pdf_url') in paper_map_by_url:
-                    papers_for_sub_query.append(paper_map_by_url[raw_paper['pdf_url']])
+            indices = [
+                view.url_index[raw_paper['pdf_url']]
+                for raw_paper in raw_results
+                if raw_paper.get('pdf_url') in view.url_index
+            ]
             
-            if papers_for_sub_query:
+            if indices:
                 # Generate a full comparative analysis for this subset of papers
-                analysis_report = self._synthesize_comparative_analysis(sub_query, papers_for_sub_query)
+                analysis_report = self._synthesize_comparative_analysis(sub_query, view, indices)
                 all_sub_query_analyses[sub_query] = analysis_report
             else:
                 all_sub_query_analyses[sub_query] = {"message": "No processed papers found for this sub-query."}
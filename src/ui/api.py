@@ -4,6 +4,8 @@ REST API 模块
 from typing import Dict, List, Optional
 from flask import Blueprint, request, jsonify
 import json
+import logging
+from src.utils import setup_logging
 
 
 def create_api(app, research_engine) -> Blueprint:
@@ -17,6 +19,9 @@ def create_api(app, research_engine) -> Blueprint:
     Returns:
         Blueprint: API 蓝图
     """
+    # 引擎的进度信息走 logging, API 单独部署时也要能看到
+    setup_logging(logging.DEBUG if app.config.get("DEBUG") else logging.INFO)
+    
     api = Blueprint("api", __name__, url_prefix="/api")
     
     @api.route("/query", methods=["POST"])
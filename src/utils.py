@@ -0,0 +1,111 @@
+"""
+Shared helpers - JSON serialization and atomic file writes used by the caches,
+and the application's log setup
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import tempfile
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # optional speedup, falls back to the stdlib json
+    orjson = None
+
+_log_listener = None
+
+
+def json_loads(raw: Union[bytes, str]) -> Any:
+    """
+    Parses JSON
+
+    Args:
+        raw: JSON bytes or text
+
+    Returns:
+        Any: parsed value
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def json_dumps(data: Any, indent: bool = False) -> bytes:
+    """
+    Serializes to UTF-8 JSON bytes
+
+    Args:
+        data: value to serialize
+        indent: indent with two spaces instead of the compact form
+
+    Returns:
+        bytes: JSON document
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+    return json.dumps(data, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
+def atomic_write(path: Union[str, Path], buf: bytes, fsync: bool = True):
+    """
+    Writes buf to a temp file next to path and renames it over path
+
+    Readers never see a torn file, and concurrent writers of the same path
+    each use their own temp file. The temp file is removed if anything fails.
+
+    Args:
+        path: destination file; its directory must exist
+        buf: content to write
+        fsync: flush the content to disk before the rename
+    """
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(buf)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def setup_logging(level: int = logging.INFO):
+    """
+    route log records through a queue so handler I/O happens in a background thread
+    
+    Called by every entrypoint (CLI, web app, REST API); only the first call
+    configures anything, and an application that already configured the root
+    logger (e.g. a WSGI server) is left alone.
+    
+    Args:
+        level: root log level
+    """
+    global _log_listener
+    root_logger = logging.getLogger()
+    if _log_listener is not None or root_logger.handlers:
+        return
+    
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+    _log_listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    
+    root_logger.addHandler(QueueHandler(log_queue))
+    root_logger.setLevel(level)
+    
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
@@ -42,6 +42,20 @@ class TestIntentUnderstanding:
         assert "original_query" in intent_dict
         assert "research_questions" in intent_dict
 
+    def test_build_prompt_matches_substitute(self):
+        """测试提示词渲染结果与 Template.substitute 一致"""
+        from string import Template
+        from src.core.intent_understanding import TEMPLATE
+        from src.llm.utils import render_template
+        
+        prompt = self.understanding._build_prompt("测试查询", "背景")
+        assert prompt == TEMPLATE.substitute(query="测试查询", context="背景")
+        
+        template = Template("$$5 for ${item}s: $item, $count")
+        assert render_template(template, item="GPU", count=2) == "$5 for GPUs: GPU, 2"
+        with pytest.raises(KeyError):
+            render_template(template, item="GPU")
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
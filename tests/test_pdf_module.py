@@ -69,6 +69,167 @@ class TestCacheManager:
         # 创建新实例，应该能读取元数据
         cache2 = CacheManager(cache_dir=cache_dir)
         assert cache2.has_cached_pdf("test_paper")
+    
+    def test_metadata_log_replay(self, cache_dir):
+        """测试元数据日志回放与压缩"""
+        from src.pdf_management import CacheManager
+        
+        cache1 = CacheManager(cache_dir=cache_dir)
+        for i in range(40):
+            cache1.register_pdf(
+                paper_id=f"paper_{i}",
+                url=f"https://example.com/paper_{i}.pdf",
+                file_path=f"{cache_dir}/paper_{i}.pdf",
+            )
+            cache1.update_metadata(f"paper_{i}", status="extracted")
+        cache1.delete_cached_pdf("paper_0")
+        cache1.flush()
+        
+        # 日志超过存活条目两倍后会被压缩为快照
+        assert cache1._log_lines <= 2 * 39
+        assert cache1.metadata_file.exists()
+        
+        cache2 = CacheManager(cache_dir=cache_dir)
+        assert len(cache2.get_all_cached_papers()) == 39
+        assert cache2.get_metadata("paper_1").status == "extracted"
+        assert cache2.get_metadata("paper_0") is None
+
+    def test_batch_coalesces_log(self, cache_dir):
+        """测试批处理内同一论文的多次更新合并为一条日志"""
+        from src.pdf_management import CacheManager
+
+        cache1 = CacheManager(cache_dir=cache_dir)
+        cache1.begin_batch()
+        cache1.register_pdf(
+            paper_id="test_paper",
+            url="https://example.com/paper.pdf",
+            file_path=f"{cache_dir}/paper.pdf",
+        )
+        cache1.update_metadata("test_paper", status="processing")
+        cache1.update_metadata("test_paper", status="extracted")
+        cache1.commit_batch()
+
+        assert cache1._log_lines == 1
+
+        cache2 = CacheManager(cache_dir=cache_dir)
+        assert cache2.get_metadata("test_paper").status == "extracted"
+
+    def test_cleanup_keeps_recently_used(self, cache_dir):
+        """测试重启后仍按最近访问顺序清理，最久未访问的论文最先被淘汰"""
+        from src.pdf_management import CacheManager
+
+        cache1 = CacheManager(cache_dir=cache_dir)
+        for paper_id in ("a", "b", "c"):
+            path = cache1.get_cache_path(paper_id)
+            path.write_bytes(b"%PDF" + b"x" * 100 * 1024)
+            cache1.register_pdf(
+                paper_id=paper_id,
+                url=f"https://example.com/{paper_id}.pdf",
+                file_path=str(path),
+            )
+        cache1.get_metadata("a")
+        cache1.close()
+
+        cache2 = CacheManager(cache_dir=cache_dir)
+        cache2.cleanup(max_size_mb=0.25)
+
+        assert cache2.get_all_cached_papers() == ["c", "a"]
+        assert not cache2.get_cache_path("b").exists()
+        assert cache2.get_cache_path("a").exists()
+
+    def test_access_order_survives_exit_without_close(self, cache_dir):
+        """测试未调用 close() 退出时（只执行退出时的 flush）访问顺序仍被保留"""
+        from src.pdf_management import CacheManager
+
+        cache1 = CacheManager(cache_dir=cache_dir)
+        for paper_id in ("a", "b", "c"):
+            path = cache1.get_cache_path(paper_id)
+            path.write_bytes(b"%PDF" + b"x" * 100 * 1024)
+            cache1.register_pdf(
+                paper_id=paper_id,
+                url=f"https://example.com/{paper_id}.pdf",
+                file_path=str(path),
+            )
+        cache1.has_cached_pdf("a")
+        cache1.flush()  # 退出时的 atexit 钩子只做这一步
+
+        cache2 = CacheManager(cache_dir=cache_dir)
+        cache2.cleanup(max_size_mb=0.25)
+
+        assert cache2.get_all_cached_papers() == ["c", "a"]
+        assert not cache2.get_cache_path("b").exists()
+
+    def test_timed_flush_without_further_mutations(self, cache_dir):
+        """测试无后续修改时缓冲的元数据也会按时写入日志"""
+        import time
+        from src.pdf_management import CacheManager
+
+        cache = CacheManager(cache_dir=cache_dir)
+        cache._flush_interval = 0.05
+        cache.register_pdf(
+            paper_id="test_paper",
+            url="https://example.com/paper.pdf",
+            file_path=f"{cache_dir}/paper.pdf",
+        )
+        time.sleep(0.01)
+        cache.update_metadata("test_paper", status="processing")
+
+        deadline = time.monotonic() + 2
+        while cache._log_lines < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert cache._log_lines == 2
+        assert CacheManager(cache_dir=cache_dir).get_metadata("test_paper").status == "processing"
+
+    def test_unused_manager_is_collected(self, cache_dir):
+        """测试未关闭的缓存管理器不会被退出钩子一直引用"""
+        import gc
+        import weakref
+        from src.pdf_management import CacheManager
+
+        cache = CacheManager(cache_dir=cache_dir)
+        ref = weakref.ref(cache)
+        del cache
+        gc.collect()
+
+        assert ref() is None
+
+    def test_stats_during_concurrent_lookups(self, cache_dir):
+        """测试统计与并发访问（调整 LRU 顺序）同时进行时不报错"""
+        import sys
+        import threading
+        from src.pdf_management import CacheManager
+
+        cache = CacheManager(cache_dir=cache_dir)
+        cache.begin_batch()
+        paper_ids = [f"paper_{i}" for i in range(2000)]
+        for paper_id in paper_ids:
+            cache.register_pdf(
+                paper_id=paper_id,
+                url=f"https://example.com/{paper_id}.pdf",
+                file_path=f"{cache_dir}/{paper_id}.pdf",
+            )
+        cache.commit_batch()
+
+        stop = threading.Event()
+
+        def touch():
+            while not stop.is_set():
+                for paper_id in paper_ids[::7]:
+                    cache.get_metadata(paper_id)
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        worker = threading.Thread(target=touch)
+        worker.start()
+        try:
+            for _ in range(20):
+                assert cache.get_cache_stats()["total_papers"] == 2000
+                assert len(cache.get_all_cached_papers()) == 2000
+        finally:
+            stop.set()
+            worker.join()
+            sys.setswitchinterval(interval)
 
 
 # 测试 PDF 下载
@@ -100,6 +261,81 @@ class TestPDFDownloader:
         result = downloader._validate_pdf(str(pdf_path))
         assert result is True
 
+    def test_resume_after_connection_drop(self, tmp_path):
+        """测试响应体传输中断后重试, 并从 .part 文件续传"""
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from src.pdf_management import PDFDownloader
+
+        body = b"%PDF-1.4\n" + b"x" * 200000
+        requests_seen = []
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                requests_seen.append(self.headers.get("Range"))
+                if len(requests_seen) == 1:
+                    # 只发送一半就断开连接
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/pdf")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body[:len(body) // 2])
+                    self.wfile.flush()
+                    self.connection.close()
+                    return
+                start = int(self.headers["Range"].split("=")[1].rstrip("-"))
+                self.send_response(206)
+                self.send_header("Content-Type", "application/pdf")
+                self.send_header("Content-Length", str(len(body) - start))
+                self.end_headers()
+                self.wfile.write(body[start:])
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            downloader = PDFDownloader(download_dir=str(tmp_path), max_retries=1, chunk_size=4096)
+            output_path = str(tmp_path / "paper.pdf")
+            result = downloader.download_paper(f"http://127.0.0.1:{server.server_port}/paper.pdf", output_path)
+        finally:
+            server.shutdown()
+
+        assert result["success"], result["error"]
+        assert (tmp_path / "paper.pdf").read_bytes() == body
+        assert requests_seen[0] is None and requests_seen[1].startswith("bytes=")
+
+
+    def test_connect_failures_not_retried_twice(self, tmp_path):
+        """测试未收到响应的失败只由会话适配器重试, 不会在外层再重试一遍"""
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from src.pdf_management import PDFDownloader
+
+        requests_seen = []
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                # 不发送任何响应就断开连接
+                requests_seen.append(self.path)
+                self.close_connection = True
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            downloader = PDFDownloader(download_dir=str(tmp_path), max_retries=1)
+            result = downloader.download_paper(
+                f"http://127.0.0.1:{server.server_port}/paper.pdf", str(tmp_path / "paper.pdf")
+            )
+        finally:
+            server.shutdown()
+
+        assert not result["success"]
+        assert len(requests_seen) == 2
 
 # 测试 PDF 解析
 class TestPDFParser:
@@ -140,6 +376,150 @@ class TestPDFParser:
         assert PDFParser._looks_like_citation("This is text") is False
         assert PDFParser._looks_like_citation("") is False
 
+    def test_numbered_references_heading(self):
+        """测试带编号的参考文献标题"""
+        from src.pdf_management import PDFParser, PDFPage
+
+        pages = [
+            PDFPage(page_number=1, text="1. INTRODUCTION\nSee references below."),
+            PDFPage(page_number=2, text="VII. REFERENCES\n[1] A. Smith, Title, 2020."),
+        ]
+
+        assert PDFParser().extract_citations(pages) == ["[1] A. Smith, Title, 2020."]
+
+    def test_parse_and_citations(self):
+        """测试章节解析与引用抽取合并为一次遍历"""
+        from src.pdf_management import PDFParser, PDFPage
+
+        pages = [
+            PDFPage(page_number=1, text="ABSTRACT\nWe study things.\nMETHOD\nSteps."),
+            PDFPage(page_number=2, text="REFERENCES\n[1] A. Smith, Title, 2020.\n[2] B. Jones, Other, 2021."),
+        ]
+        parser = PDFParser()
+        sections, citations = parser.parse_and_citations(pages)
+
+        assert [s.title for s in sections] == [s.title for s in parser.parse_structure(pages)]
+        assert citations == parser.extract_citations(pages)
+        assert len(citations) == 2
+
+    def test_references_end_at_appendix(self):
+        """测试引用取正文后的第一个参考文献标题, 并在附录处结束"""
+        from src.pdf_management import PDFParser, PDFPage
+
+        pages = [
+            PDFPage(page_number=1, text="INTRODUCTION\nWe study things."),
+            PDFPage(page_number=2, text="REFERENCES\n[1] A. Smith, Title, 2020."),
+            PDFPage(page_number=3, text="[2] B. Jones, Other, 2021.\nAPPENDIX A\n[3] Table row, 1, 2, 3, 4, 5"),
+            PDFPage(page_number=4, text="References\n[4] C. Lee, Appendix work, 2022."),
+        ]
+        parser = PDFParser()
+        expected = ["[1] A. Smith, Title, 2020.", "[2] B. Jones, Other, 2021."]
+
+        assert parser.extract_citations(pages) == expected
+        assert parser.parse_and_citations(pages)[1] == expected
+
+    def test_pages_cache_is_json(self, tmp_path, monkeypatch):
+        """测试页面缓存以 JSON 写入磁盘, 新的解析器实例可直接读回"""
+        from src.pdf_management import PDFParser, PDFPage
+
+        pdf_path = tmp_path / "paper.pdf"
+        pdf_path.write_bytes(b"%PDF-1.4\n")
+        pages = [
+            PDFPage(page_number=1, text="Abstract", metadata={"rotation": 0}),
+            PDFPage(page_number=2, text="References"),
+        ]
+        monkeypatch.setattr(PDFParser, "_iter_pages_uncached", lambda self, pdf: iter(pages))
+        assert PDFParser(cache_dir=str(tmp_path / "pages")).extract_text(str(pdf_path)) == pages
+
+        (cache_file,) = (tmp_path / "pages").iterdir()
+        assert cache_file.suffix == ".json"
+        assert json.loads(cache_file.read_bytes())[0]["text"] == "Abstract"
+
+        def fail(self, pdf):
+            raise AssertionError("pages should come from the cache")
+
+        monkeypatch.setattr(PDFParser, "_iter_pages_uncached", fail)
+        assert PDFParser(cache_dir=str(tmp_path / "pages")).extract_text(str(pdf_path)) == pages
+
+    def test_count_and_extract_page_range(self, tmp_path):
+        """测试公开的页数统计和页范围文本提取, 路径与内存内容结果一致"""
+        import io
+        pdfium = pytest.importorskip("pypdfium2")
+        from src.pdf_management import count_pages, extract_page_range_text
+
+        pdf = pdfium.PdfDocument.new()
+        for _ in range(3):
+            pdf.new_page(612, 792)
+        buf = io.BytesIO()
+        pdf.save(buf)
+        pdf.close()
+        pdf_path = tmp_path / "blank.pdf"
+        pdf_path.write_bytes(buf.getvalue())
+
+        assert count_pages(str(pdf_path)) == count_pages(buf.getvalue()) == 3
+        # 空白页之间以换行连接
+        assert extract_page_range_text(str(pdf_path)) == "\n\n"
+        assert extract_page_range_text(buf.getvalue(), 1, 10) == "\n"
+
+    def test_parse_extraction_response(self):
+        """测试 LLM 抽取结果解析"""
+        from src.pdf_management import PDFParser
+
+        response = (
+            "<response><title> Paper </title><authors>A; B;</authors>"
+            "<methodology>step 1\nstep 2</methodology><results>r</results></response>"
+        )
+        info = PDFParser._parse_extraction_response(response)
+
+        assert info.title == "Paper"
+        assert info.authors == ["A", "B"]
+        assert info.methodology == "step 1\nstep 2"
+        assert info.results == "r"
+        assert info.abstract is None
+
+    def test_parse_extraction_response_json(self):
+        """测试 JSON 格式的抽取结果解析"""
+        from src.pdf_management import PDFParser
+
+        response = '```json\n{"title": " Paper ", "authors": ["A", "B"], "objective": "o"}\n```'
+        info = PDFParser._parse_extraction_response(response)
+
+        assert info.title == "Paper"
+        assert info.authors == ["A", "B"]
+        assert info.objectives == "o"
+        assert info.results is None
+
+    def test_local_extraction_asks_llm_for_gaps(self):
+        """测试章节内容充足时跳过完整的 LLM 抽取, 只请求章节无法提供的字段"""
+        from src.pdf_management import PDFParser
+        from src.pdf_management.parser import PDFSection
+
+        class RecordingLLM:
+            prompts = []
+
+            def call(self, prompt, **kwargs):
+                RecordingLLM.prompts.append(prompt)
+                return '{"authors": "A. Smith; B. Jones", "datasets": "ImageNet", "methodology": "llm"}'
+
+        body = "x" * 300
+        sections = [
+            PDFSection(title=t, start_page=1, end_page=1, content=body, content_preview=body)
+            for t in ("Abstract", "Method", "Results", "Conclusion")
+        ]
+        parser = PDFParser(llm_client=RecordingLLM())
+        info = parser.extract_key_information("", sections)
+
+        (prompt,) = RecordingLLM.prompts
+        assert '"datasets"' in prompt and '"methodology"' not in prompt
+        assert info.methodology == body
+        assert info.conclusion == body
+        assert info.authors == ["A. Smith", "B. Jones"]
+        assert info.datasets == "ImageNet"
+
+        # 只需要本地已覆盖的字段时不调用 LLM
+        parser.extract_key_information("", sections, include=("abstract", "methodology"))
+        assert len(RecordingLLM.prompts) == 1
+
 
 # 测试 PDF 处理器
 class TestPDFProcessor:
@@ -162,13 +542,17 @@ class TestPDFProcessor:
             title="Test Paper",
             authors=["Author 1"],
             abstract="Test abstract",
-            introduction="Test intro",
+            objectives="Test objectives",
             methodology="Test method",
+            datasets="",
+            models="",
+            evaluation="",
             results="Test results",
-            conclusion="Test conclusion",
-            references=["Ref 1"],
+            contributions="Test contributions",
+            limitations="",
             figures=[],
             tables=[],
+            conclusion="Test conclusion",
         )
         
         converted = PDFProcessor._convert_to_dict(info)
@@ -176,6 +560,7 @@ class TestPDFProcessor:
         assert isinstance(converted, dict)
         assert converted["title"] == "Test Paper"
         assert converted["authors"] == ["Author 1"]
+        assert converted["conclusion"] == "Test conclusion"
 
 
 # 集成测试
@@ -233,6 +618,37 @@ class TestPDFIntegration:
         assert enriched["title"] == "Test Paper"
 
 
+    def test_batch_uses_pdf_url(self, tmp_path, monkeypatch):
+        """测试批量丰富时分组、预取和处理都使用 pdf_url"""
+        from src.pdf_management import PDFProcessor
+        from src.pdf_management.integration import PDFIntegrationAdapter
+
+        prefetched = []
+        processed = []
+
+        def prefetch_pdfs(self, papers, urlkey):
+            prefetched.extend(paper[urlkey] for paper in papers)
+
+        def process_paper(self, paper, urlkey, return_bytes=False):
+            processed.append(paper[urlkey])
+            return {"success": False, "error": "offline"}
+
+        monkeypatch.setattr(PDFProcessor, "prefetch_pdfs", prefetch_pdfs)
+        monkeypatch.setattr(PDFProcessor, "process_paper", process_paper)
+        adapter = PDFIntegrationAdapter(cache_dir=str(tmp_path))
+
+        papers = [
+            {"title": "A", "pdf_url": "https://example.com/a.pdf"},
+            {"title": "A (dup)", "pdf_url": "https://example.com/a.pdf"},
+            {"title": "B", "url": "https://example.com/b"},  # 只有网页链接
+        ]
+        enriched = adapter.enrich_papers_batch(papers)
+
+        assert prefetched == ["https://example.com/a.pdf"] * 2
+        assert processed == ["https://example.com/a.pdf"]
+        assert enriched[0]["pdf_error"] == enriched[1]["pdf_error"] == "offline"
+        assert "pdf_error" not in enriched[2]
+
 # 性能测试
 class TestPerformance:
     """性能测试"""
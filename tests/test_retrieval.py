@@ -0,0 +1,265 @@
+"""
+检索模块测试
+"""
+import os
+import time
+
+
+# 测试检索结果磁盘缓存
+class TestSearchDiskCache:
+    """搜索结果磁盘缓存测试"""
+
+    @staticmethod
+    def _make_source(ttl, cache_dir=None):
+        """创建一个记录调用次数的假数据源"""
+        from src.retrieval._cache import disk_cache
+
+        class FakeSource:
+            def __init__(self):
+                self.calls = 0
+                self.results = [{"title": "Attention Is All You Need"}]
+
+            @disk_cache(ttl=ttl, cache_dir=cache_dir)
+            def search(self, query, top_k=10):
+                self.calls += 1
+                return self.results
+
+        return FakeSource()
+
+    def test_hit_within_ttl(self, tmp_path):
+        """测试 TTL 内命中缓存"""
+        source = self._make_source(ttl=60, cache_dir=str(tmp_path))
+
+        assert source.search("transformers", top_k=5) == source.results
+        assert source.search("transformers", top_k=5) == source.results
+        assert source.calls == 1
+
+        # 不同的 top_k 是不同的条目
+        source.search("transformers", top_k=3)
+        assert source.calls == 2
+
+        # force_refresh 跳过缓存
+        source.search("transformers", top_k=5, force_refresh=True)
+        assert source.calls == 3
+
+    def test_expired_entry_is_refetched_and_removed(self, tmp_path):
+        """测试过期条目被重新获取, 旧文件被删除"""
+        source = self._make_source(ttl=60, cache_dir=str(tmp_path))
+        source.search("transformers")
+        (entry,) = list(tmp_path.iterdir())
+
+        stale = time.time() - 120
+        os.utime(entry, (stale, stale))
+        source.results = []  # 失败的搜索不会写回缓存
+        assert source.search("transformers") == []
+        assert source.calls == 2
+        assert not entry.exists()
+
+    def test_empty_results_not_cached(self, tmp_path):
+        """测试空结果不缓存"""
+        source = self._make_source(ttl=60, cache_dir=str(tmp_path))
+        source.results = []
+
+        source.search("transformers")
+        source.search("transformers")
+
+        assert source.calls == 2
+        assert list(tmp_path.iterdir()) == []
+
+    def test_default_dir_follows_config(self, tmp_path, monkeypatch):
+        """测试默认缓存目录来自 Config.CACHE_DIR"""
+        from src.config import Config
+
+        monkeypatch.setattr(Config, "CACHE_DIR", str(tmp_path))
+        source = self._make_source(ttl=60)
+        source.search("transformers")
+
+        assert len(list((tmp_path / "search").iterdir())) == 1
+
+
+# 测试语义查询缓存
+class TestSemanticQueryCache:
+    """语义查询缓存测试"""
+
+    def test_group_paraphrases(self):
+        """测试同一批中的近似查询归为一组, 只由组长检索"""
+        from src.retrieval import SemanticQueryCache
+
+        cache = SemanticQueryCache(threshold=0.9)
+        embeddings = [[1, 0], [0.99, 0.05], [0, 1], None, [0.05, 1]]
+
+        assert cache.group(embeddings) == [0, 0, 2, 3, 2]
+
+    RESULTS = {"arxiv": [{"title": "Attention Is All You Need"}]}
+
+    def test_hit_and_miss_at_threshold(self):
+        """测试相似度阈值处的命中与未命中"""
+        import math
+        from src.retrieval import SemanticQueryCache
+
+        cache = SemanticQueryCache(threshold=0.9)
+        cache.put([1.0, 0.0], ["arxiv"], 10, self.RESULTS)
+
+        def at(cosine):
+            return [cosine, math.sqrt(1 - cosine ** 2)]
+
+        assert cache.get(at(0.91), ["arxiv"], 10) == self.RESULTS
+        assert cache.get(at(0.89), ["arxiv"], 10) is None
+        assert cache.get([2.0, 0.0], ["arxiv"], 10) == self.RESULTS  # 与向量长度无关
+
+    def test_namespace_isolation(self):
+        """测试不同数据源或 top_k 互不命中"""
+        from src.retrieval import SemanticQueryCache
+
+        cache = SemanticQueryCache()
+        cache.put([1.0, 0.0], ["arxiv"], 10, self.RESULTS)
+
+        assert cache.get([1.0, 0.0], ["semantic_scholar"], 10) is None
+        assert cache.get([1.0, 0.0], ["arxiv"], 5) is None
+        assert cache.get([1.0, 0.0], ["arxiv"], 10) == self.RESULTS
+
+    def test_ttl_expiry(self, monkeypatch):
+        """测试条目过期"""
+        import time
+        from src.retrieval import SemanticQueryCache
+
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now)
+        cache = SemanticQueryCache(ttl=60)
+        cache.put([1.0, 0.0], ["arxiv"], 10, self.RESULTS)
+        assert cache.get([1.0, 0.0], ["arxiv"], 10) == self.RESULTS
+
+        monkeypatch.setattr(time, "time", lambda: now + 61)
+        assert cache.get([1.0, 0.0], ["arxiv"], 10) is None
+
+        # 过期条目在下一次写入时被清除
+        cache.put([0.0, 1.0], ["arxiv"], 10, self.RESULTS)
+        assert len(cache) == 1
+
+    def test_capacity_evicts_oldest(self):
+        """测试超出容量时淘汰最早的条目"""
+        from src.retrieval import SemanticQueryCache
+
+        cache = SemanticQueryCache(max_entries=2)
+        for i, embedding in enumerate(([1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0])):
+            cache.put(embedding, ["arxiv"], 10, {"arxiv": [{"title": f"paper {i}"}]})
+
+        assert len(cache) == 2
+        assert cache.get([1.0, 0.0, 0.0], ["arxiv"], 10) is None
+        assert cache.get([0.0, 0.0, 1.0], ["arxiv"], 10) == {"arxiv": [{"title": "paper 2"}]}
+
+    def test_empty_results_not_cached(self):
+        """测试空结果不缓存"""
+        from src.retrieval import SemanticQueryCache
+
+        cache = SemanticQueryCache()
+        cache.put([1.0, 0.0], ["arxiv"], 10, {"arxiv": []})
+
+        assert len(cache) == 0
+        assert cache.get([1.0, 0.0], ["arxiv"], 10) is None
+
+
+# 测试多数据源并发检索
+class TestSearchMany:
+    """并发检索测试"""
+
+    @staticmethod
+    def _make_source(name, max_concurrency):
+        """创建一个记录并发数的假数据源, 每个查询返回带查询与来源标记的结果"""
+        import random
+        import threading
+        import time
+        from src.retrieval.paper_sources import PaperSource
+
+        class FakeSource(PaperSource):
+            MAX_CONCURRENCY = max_concurrency
+
+            def __init__(self):
+                super().__init__()
+                self.in_flight = 0
+                self.peak = 0
+                self.lock = threading.Lock()
+
+            def search(self, query, top_k=10):
+                with self.lock:
+                    self.in_flight += 1
+                    self.peak = max(self.peak, self.in_flight)
+                time.sleep(0.005 + random.uniform(0, 0.02))
+                with self.lock:
+                    self.in_flight -= 1
+                if query == "boom":
+                    raise RuntimeError("source down")
+                return [{"title": f"{name}:{query}:{i}"} for i in range(top_k)]
+
+            def fetch_paper(self, paper_id):
+                return None
+
+        return FakeSource()
+
+    def test_results_keyed_by_query_and_source(self):
+        """测试并发下结果按查询与来源正确归位, 且每个来源的并发数受限"""
+        from src.retrieval.paper_sources import PaperSourceManager
+
+        manager = PaperSourceManager()
+        slow = self._make_source("slow", max_concurrency=1)
+        fast = self._make_source("fast", max_concurrency=4)
+        manager.register_source("slow", slow)
+        manager.register_source("fast", fast)
+
+        queries = [f"query {i}" for i in range(8)] + ["boom", "query 0"]
+        results = manager.search_many(queries, ["slow", "fast"], top_k=2)
+
+        assert list(results) == [f"query {i}" for i in range(8)] + ["boom"]
+        for query in queries[:8]:
+            for source in ("slow", "fast"):
+                assert results[query][source] == [
+                    {"title": f"{source}:{query}:0"},
+                    {"title": f"{source}:{query}:1"},
+                ]
+        assert results["boom"] == {"slow": [], "fast": []}
+        assert slow.peak == 1
+        assert 1 < fast.peak <= 4
+
+    def test_min_request_interval(self):
+        """测试同一来源的请求间隔不小于 MIN_REQUEST_INTERVAL"""
+        import time
+
+        source = self._make_source("paced", max_concurrency=1)
+        source.MIN_REQUEST_INTERVAL = 0.05
+
+        start = time.monotonic()
+        for _ in range(3):
+            source._wait_for_turn()
+
+        assert time.monotonic() - start >= 0.1
+
+
+# 测试跨数据源去重
+class TestCrossSourceDedup:
+    """跨数据源去重测试"""
+
+    def test_placeholder_titles_not_merged(self):
+        """测试缺失或占位标题的论文不会按标题合并, 改用 url 或 id"""
+        from src.retrieval.paper_sources import PaperSourceManager
+
+        results = {
+            "arxiv": [
+                {"title": "Attention Is All You Need", "url": "https://arxiv.org/abs/1706.03762v5"},
+                {"title": "N/A", "url": "https://example.com/a", "source": "arxiv"},
+                {"title": "N/A", "url": "https://example.com/b", "source": "arxiv"},
+            ],
+            "semantic_scholar": [
+                {"title": "attention is  all you need", "url": "https://www.semanticscholar.org/p/1"},
+                {"title": "", "paper_id": "s1", "source": "semantic_scholar"},
+                {"title": None, "paper_id": "s2", "source": "semantic_scholar"},
+                {"title": "n/a", "url": "https://example.com/a/", "source": "semantic_scholar"},
+            ],
+        }
+        PaperSourceManager._drop_cross_source_duplicates(results)
+
+        assert [p["url"] for p in results["arxiv"]] == [
+            "https://arxiv.org/abs/1706.03762v5",
+            "https://example.com/a",
+            "https://example.com/b",
+        ]
+        assert [p["paper_id"] for p in results["semantic_scholar"]] == ["s1", "s2"]